@@ -1,5 +1,6 @@
 import time
 import uuid
+import threading
 from typing import Optional
 from fastapi import Request, HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
@@ -10,6 +11,7 @@ logger = logging.getLogger(__name__)
 
 # Global ProductService instance
 _product_service: Optional[ProductService] = None
+_product_service_lock = threading.Lock()
 _service_start_time = time.time()
 
 # Security scheme for optional API key authentication
@@ -20,26 +22,54 @@ def get_product_service() -> ProductService:
     """
     Dependency to get the ProductService instance.
     
+    Safe to call from several threads: the service is built once, callers
+    arriving while it loads wait for that initialization instead of starting
+    another one.
+    
     Returns:
         ProductService: Singleton instance of the product service
     """
     global _product_service
     
-    if _product_service is None:
-        try:
-            logger.info("Initializing ProductService...")
-            _product_service = ProductService()
-            logger.info("ProductService initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize ProductService: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail="Service initialization failed. Please check configuration."
-            )
+    if _product_service is not None:
+        return _product_service
+    
+    with _product_service_lock:
+        if _product_service is None:
+            try:
+                logger.info("Initializing ProductService...")
+                _product_service = ProductService()
+                logger.info("ProductService initialized successfully")
+            except Exception as e:
+                logger.error(f"Failed to initialize ProductService: {e}")
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Service initialization failed. Please check configuration."
+                )
     
     return _product_service
 
 
+def is_product_service_loading() -> bool:
+    """
+    Check whether the ProductService is being initialized right now.
+    
+    Returns:
+        bool: True while the indexes are still loading
+    """
+    return _product_service is None and _product_service_lock.locked()
+
+
+def is_product_service_ready() -> bool:
+    """
+    Check whether the ProductService has been initialized.
+    
+    Returns:
+        bool: True once the indexes are loaded
+    """
+    return _product_service is not None
+
+
 def get_service_uptime() -> float:
     """
     Get service uptime in seconds.
@@ -126,6 +156,11 @@ def check_service_health() -> dict:
         "bm25_index": "unknown"
     }
     
+    # Don't block on the lock while the indexes are still loading
+    if is_product_service_loading():
+        health_status["product_service"] = "starting"
+        return health_status
+    
     try:
         # Check if ProductService is initialized
         service = get_product_service()
@@ -3,6 +3,7 @@ import logging
 from typing import Callable
 from fastapi import Request, Response, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from starlette.middleware.base import BaseHTTPMiddleware
 from .dependencies import check_rate_limit, get_client_ip, generate_request_id
 
@@ -117,6 +118,10 @@ def setup_cors(app):
 def setup_middleware(app):
     """Setup all middleware for the application."""
     
+    # Compress larger payloads (search results with full product descriptions).
+    # Innermost, so it sees whole response bodies and minimum_size applies
+    app.add_middleware(GZipMiddleware, minimum_size=512, compresslevel=5)
+    
     # Rate limiting (apply first, before logging)
     app.add_middleware(RateLimitMiddleware, calls_per_hour=1000)
     
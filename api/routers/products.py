@@ -9,7 +9,8 @@ from core.models.product import Product
 import base64
 import io
 from PIL import Image, UnidentifiedImageError
-from data.productos_del_json_copy import PRODUCTS_JSON
+from core.config.settings import settings
+from data import productos_del_json_copy as catalog
 
 from ..models.requests import (
     ProductCreateRequest, 
@@ -70,6 +71,23 @@ import os
 from pathlib import Path
 import psycopg2
 
+
+def _embed_product_texts(service: ProductService, title: str, description: str, caption: Optional[str] = None):
+    """Embed title, description and (optional) caption with a single embeddings request."""
+    texts = [title, description]
+    if caption and caption.strip():
+        texts.append(caption)
+    embeddings = service.vector_repo.embedding_service.generate_embeddings_batch(texts)
+    # The batch call drops blank texts: embeddings are picked by position, so they must all be there
+    if len(embeddings) != len(texts):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Title and description cannot be empty or only whitespace"
+        )
+    caption_embedding = embeddings[2] if len(embeddings) > 2 else None
+    return embeddings[0], embeddings[1], caption_embedding
+
+
 @router.post("/load-from-database",
     response_model=BatchResponse,
     status_code=status.HTTP_201_CREATED)
@@ -109,6 +127,8 @@ async def load_products_from_database(
         
         products_data = cursor.fetchall()
         
+        products = []
+        seen_ids = set()
         for product_row in products_data:
             try:
                 product_id, title, description, image_path, caption = product_row
@@ -120,26 +140,41 @@ async def load_products_from_database(
                     })
                     continue
                 
+                if product_id in service.vector_repo.products or product_id in seen_ids:
+                    raise ValueError(f"Product with ID {product_id} already exists")
+                seen_ids.add(product_id)
+                
                 # Crear el producto directamente
-                product = Product(
+                products.append(Product(
                     id=product_id,
                     title=title,
                     description=description,
                     image_url=image_path
-                )
+                ))
                 
-                # Agregar a todos los repositorios manualmente
-                service.vector_repo.add_product(product)
-                service.bm25_repo.add_product(product)
+            except Exception as e:
+                failed.append({
+                    "id": product_row[0] if product_row else 'unknown',
+                    "error": f"Loading failed: {str(e)}"
+                })
+        
+        # Índices de texto en bloque: una petición de embeddings por lote y una sola reconstrucción BM25
+        if products:
+            service.vector_repo.create_index(products)
+            service.bm25_repo.add_products(products)
+            service._invalidate_query_cache()
+        
+        for product in products:
+            try:
                 service.image_repo.add_image(product)
                 service.caption_repo.add_caption(product)
                 
                 successful.append(product.id)
-                logger.debug(f"Successfully loaded product {product_id} from database [Request: {request_id}]")
+                logger.debug(f"Successfully loaded product {product.id} from database [Request: {request_id}]")
                 
             except Exception as e:
                 failed.append({
-                    "id": product_row[0] if product_row else 'unknown',
+                    "id": product.id,
                     "error": f"Loading failed: {str(e)}"
                 })
         
@@ -187,17 +222,16 @@ async def load_products_from_json(
     failed = []
     
     try:
-        for product_data in PRODUCTS_JSON:
+        products = []
+        product_rows = {}
+        # Recorre el catálogo por columnas (SoA): solo se leen los campos necesarios
+        columns = zip(catalog.IDS.tolist(), catalog.TITLES, catalog.DESCRIPTIONS, catalog.IMAGE_URLS)
+        for row, (catalog_id, title, description, image_path) in enumerate(columns):
+            product_id = str(catalog_id)
             try:
-                product_id = str(product_data.get('id'))
-                title = product_data.get('title')
-                description = product_data.get('description')
-                image_path = product_data.get('image_url')
-                caption = product_data.get('caption')
-                
-                if not all([product_id, title, description, image_path]):
+                if not all([title, description, image_path]):
                     failed.append({
-                        "id": product_id or "unknown",
+                        "id": product_id,
                         "error": "Missing required fields"
                     })
                     continue
@@ -209,29 +243,72 @@ async def load_products_from_json(
                     })
                     continue
                 
+                if product_id in service.vector_repo.products or product_id in product_rows:
+                    raise ValueError(f"Product with ID {product_id} already exists")
+                
                 # Crear el producto directamente
-                product = Product(
+                products.append(Product(
                     id=product_id,
                     title=title,
                     description=description,
                     image_url=image_path
-                )
+                ))
+                product_rows[product_id] = row
                 
-                # Agregar a todos los repositorios manualmente
-                service.vector_repo.add_product(product)
-                service.bm25_repo.add_product(product)
+            except Exception as e:
+                failed.append({
+                    "id": product_id,
+                    "error": f"Creation failed: {str(e)}"
+                })
+        
+        # Índices de texto en bloque: una petición de embeddings por lote y una sola reconstrucción BM25
+        if products:
+            service.vector_repo.create_index(products)
+            service.bm25_repo.add_products(products)
+            service._invalidate_query_cache()
+        
+        # Decodifica todas las imágenes del catálogo en paralelo; add_image las toma de la caché
+        if products:
+            catalog.preload_images()
+        
+        indexed = []
+        for product in products:
+            try:
                 service.image_repo.add_image(product)
-                service.caption_repo.add_caption(product, caption)
-                
-                successful.append(product.id)
-                logger.debug(f"Successfully created product {product_id} [Request: {request_id}]")
-                
+                indexed.append(product)
             except Exception as e:
                 failed.append({
-                    "id": product_data.get('id', 'unknown'),
+                    "id": product.id,
                     "error": f"Creation failed: {str(e)}"
                 })
         
+        # Captions en bloque; usa los embeddings precalculados (build_caption_embeddings.py) si están al día
+        if indexed:
+            caption_embeddings = catalog.load_caption_embeddings(settings.OPENAI_MODEL)
+            rows = [product_rows[product.id] for product in indexed]
+            captions = catalog.CAPTIONS[rows].tolist()
+            try:
+                service.caption_repo.add_captions(
+                    indexed,
+                    captions,
+                    embeddings=None if caption_embeddings is None else caption_embeddings[rows]
+                )
+                successful.extend(product.id for product in indexed)
+                logger.debug(f"Successfully created {len(indexed)} products [Request: {request_id}]")
+            except Exception as e:
+                # El lote no añade nada si falla: se reintenta producto a producto para
+                # que successful/failed reflejen lo que quedó indexado de verdad
+                logger.warning(f"Batch caption insert failed, retrying one by one: {e} [Request: {request_id}]")
+                for product, caption in zip(indexed, captions):
+                    try:
+                        service.caption_repo.add_caption(product, caption)
+                        successful.append(product.id)
+                    except Exception as e:
+                        failed.append({
+                            "id": product.id,
+                            "error": f"Creation failed: {str(e)}"
+                        })
+        
         # Guardar todos los índices al final
         service.vector_repo.save_index()
         service.caption_repo.save_index()
@@ -242,7 +319,7 @@ async def load_products_from_json(
         return BatchResponse(
             successful=successful,
             failed=failed,
-            total_processed=len(PRODUCTS_JSON),
+            total_processed=len(catalog.IDS),
             success_count=len(successful),
             failure_count=len(failed),
             execution_time_ms=execution_time
@@ -323,13 +400,13 @@ async def create_product(
         """, (product.id, product.title, product.description, product.image_url))
         
         # Generar embeddings
-        title_embedding = service.vector_repo.embedding_service.generate_embedding(product.title)
-        desc_embedding = service.vector_repo.embedding_service.generate_embedding(product.description)
         image_embedding = service.image_service._compute_image_embedding(product.image_url).flatten().tolist()
         
-        # Generar caption y su embedding
+        # Generar caption; título, descripción y caption se embeben en una sola petición
         caption = service.image_service.generar_descripcion_imagen(product.image_url)
-        caption_embedding = service.vector_repo.embedding_service.generate_embedding(caption) if caption else None
+        title_embedding, desc_embedding, caption_embedding = _embed_product_texts(
+            service, product.title, product.description, caption
+        )
         
         # Insertar embeddings
         cursor.execute("""
@@ -363,6 +440,63 @@ async def create_product(
             conn.close()
 
         
+@router.delete("/batch",
+    response_model=BatchResponse,
+    summary="Batch delete products",
+    description="Delete multiple products in a single request.")
+async def batch_delete_products(
+    batch_request: BatchDeleteRequest,
+    request: Request,
+    service: ProductService = Depends(get_product_service),
+    api_key: Optional[str] = Depends(verify_api_key)
+):
+    """Batch delete multiple products."""
+    request_id = get_request_id(request)
+    start_time = time.time()
+    
+    logger.info(f"Batch deleting {len(batch_request.product_ids)} products [Request: {request_id}]")
+    
+    successful_ids = []
+    failed = []
+    
+    try:
+        for product_id in batch_request.product_ids:
+            try:
+                success = service.delete_product(product_id)
+                if success:
+                    successful_ids.append(product_id)
+                else:
+                    failed.append({
+                        "id": product_id,
+                        "error": "Product not found"
+                    })
+            except Exception as e:
+                failed.append({
+                    "id": product_id,
+                    "error": str(e)
+                })
+        
+        execution_time = (time.time() - start_time) * 1000
+        
+        logger.info(f"Batch deletion completed: {len(successful_ids)} successful, {len(failed)} failed [Request: {request_id}]")
+        
+        return BatchResponse(
+            successful=successful_ids,
+            failed=failed,
+            total_processed=len(batch_request.product_ids),
+            success_count=len(successful_ids),
+            failure_count=len(failed),
+            execution_time_ms=execution_time
+        )
+        
+    except Exception as e:
+        logger.error(f"Unexpected error in batch deletion: {e} [Request: {request_id}]")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error occurred"
+        )
+
+
 @router.get("/{product_id}",
     response_model=ProductResponse,
     summary="Get product by ID",
@@ -464,9 +598,13 @@ async def update_product(
             WHERE id_producto = %s
         """, (updated_product.title, updated_product.description, updated_product.image_url, product_id))
         
-        # Regenerar embeddings
-        title_embedding = service.vector_repo.embedding_service.generate_embedding(updated_product.title)
-        desc_embedding = service.vector_repo.embedding_service.generate_embedding(updated_product.description)
+        # Si hay nueva imagen, generar su caption para embeberlo junto al texto
+        caption = service.image_service.generar_descripcion_imagen(updated_product.image_url) if image_obj else None
+        
+        # Regenerar embeddings (una sola petición)
+        title_embedding, desc_embedding, caption_embedding = _embed_product_texts(
+            service, updated_product.title, updated_product.description, caption
+        )
         
         # Actualizar embeddings de texto
         cursor.execute("""
@@ -478,8 +616,6 @@ async def update_product(
         # Si hay nueva imagen, actualizar embedding de imagen y caption
         if image_obj:
             image_embedding = service.image_service._compute_image_embedding(updated_product.image_url).flatten().tolist()
-            caption = service.image_service.generar_descripcion_imagen(updated_product.image_url)
-            caption_embedding = service.vector_repo.embedding_service.generate_embedding(caption) if caption else None
             cursor.execute("""
                 UPDATE embeddings 
                 SET embedding_imagen = %s, embedding_caption = %s
@@ -710,60 +846,3 @@ async def batch_create_products(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error occurred"
         )
-
-
-@router.delete("/batch",
-    response_model=BatchResponse,
-    summary="Batch delete products",
-    description="Delete multiple products in a single request.")
-async def batch_delete_products(
-    batch_request: BatchDeleteRequest,
-    request: Request,
-    service: ProductService = Depends(get_product_service),
-    api_key: Optional[str] = Depends(verify_api_key)
-):
-    """Batch delete multiple products."""
-    request_id = get_request_id(request)
-    start_time = time.time()
-    
-    logger.info(f"Batch deleting {len(batch_request.product_ids)} products [Request: {request_id}]")
-    
-    successful_ids = []
-    failed = []
-    
-    try:
-        for product_id in batch_request.product_ids:
-            try:
-                success = service.delete_product(product_id)
-                if success:
-                    successful_ids.append(product_id)
-                else:
-                    failed.append({
-                        "id": product_id,
-                        "error": "Product not found"
-                    })
-            except Exception as e:
-                failed.append({
-                    "id": product_id,
-                    "error": str(e)
-                })
-        
-        execution_time = (time.time() - start_time) * 1000
-        
-        logger.info(f"Batch deletion completed: {len(successful_ids)} successful, {len(failed)} failed [Request: {request_id}]")
-        
-        return BatchResponse(
-            successful=successful_ids,
-            failed=failed,
-            total_processed=len(batch_request.product_ids),
-            success_count=len(successful_ids),
-            failure_count=len(failed),
-            execution_time_ms=execution_time
-        )
-        
-    except Exception as e:
-        logger.error(f"Unexpected error in batch deletion: {e} [Request: {request_id}]")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Internal server error occurred"
-        ) 
\ No newline at end of file
@@ -1,8 +1,10 @@
+import asyncio
 import time
 import base64
 import io
 from typing import List, Optional, Dict, Any, Tuple
 from fastapi import APIRouter, Depends, HTTPException, status, Request, UploadFile, File, Body
+from fastapi.concurrency import run_in_threadpool
 
 from core.services.product_service import ProductService
 from ..models.requests import SearchRequest, SearchType, StrategySearchRequest, ImageSearchRequest, HybridImageTextRequest
@@ -29,6 +31,9 @@ from core.services.image_service import ImageService
 
 logger = logging.getLogger(__name__)
 
+# Mayor resolución que usan los modelos con la imagen de consulta (Florence-2: 768x768, CLIP: 224x224)
+MODEL_INPUT_SIZE = (768, 768)
+
 router = APIRouter(
     prefix="/search",
     tags=["search"],
@@ -77,9 +82,10 @@ async def search_products(
         
         execution_time = (time.time() - start_time) * 1000
         
-        # Build results
+        # Build results (product details fetched in one lookup)
+        products = service.get_products_by_ids(product_ids) if search_request.include_product_details else [None] * len(product_ids)
         results = []
-        for i, product_id in enumerate(product_ids):
+        for i, (product_id, product) in enumerate(zip(product_ids, products)):
             # Calculate a mock score (in real implementation, this would come from the search service)
             score = 1.0 - (i * 0.1)  # Decreasing score based on rank
             
@@ -89,10 +95,8 @@ async def search_products(
             )
             
             # Include product details if requested
-            if search_request.include_product_details:
-                product = service.get_product_by_id(product_id)
-                if product:
-                    search_result.product = product_to_response(product)
+            if product:
+                search_result.product = product_to_response(product)
             
             results.append(search_result)
         
@@ -196,12 +200,20 @@ async def keyword_search(
     return await search_products(search_request, request, service)
 
 
+def _decode_image(raw: bytes) -> Image.Image:
+    """Decode image bytes to RGB; large JPEGs are downscaled while decoding, never below MODEL_INPUT_SIZE."""
+    img = Image.open(io.BytesIO(raw))
+    # Solo tiene efecto en JPEG: libjpeg reduce la escala en la propia decodificación (DCT)
+    img.draft("RGB", MODEL_INPUT_SIZE)
+    return img.convert("RGB")
+
+
 def _load_image_from_upload_or_base64(upload_file: Optional[UploadFile], image_base64: Optional[str]) -> Image.Image:
     """Helper: return PIL Image from either UploadFile or base64 string."""
     if upload_file is not None:
         data = upload_file.file.read()
         try:
-            return Image.open(io.BytesIO(data)).convert("RGB")
+            return _decode_image(data)
         finally:
             try:
                 upload_file.file.seek(0)
@@ -214,13 +226,31 @@ def _load_image_from_upload_or_base64(upload_file: Optional[UploadFile], image_b
             if image_base64.startswith("data:"):
                 image_base64 = image_base64.split(",", 1)[1]
             raw = base64.b64decode(image_base64)
-            return Image.open(io.BytesIO(raw)).convert("RGB")
+            return _decode_image(raw)
         except Exception as e:
             raise ValueError(f"Invalid base64 image data: {e}")
 
     raise ValueError("No image provided")
 
 
+async def _encode_query_image(service: ProductService, img: Image.Image, with_caption: bool = False):
+    """
+    Run the model work for an image query off the event loop.
+
+    Only CLIP (and Florence-2 when with_caption is set) run in threads, where concurrent
+    requests share a CLIP pass through the batcher. The index lookups stay on the loop,
+    so they never race with the product handlers that mutate the indexes.
+    """
+    image_service = service.search_service.image_service
+    embedding_task = run_in_threadpool(image_service._compute_image_embedding, img)
+    if not with_caption:
+        return await embedding_task, None
+    return await asyncio.gather(
+        embedding_task,
+        run_in_threadpool(image_service.generar_descripcion_imagen, img)
+    )
+
+
 @router.post("/image",
     response_model=ImageSearchResponse,
     summary="Image search",
@@ -244,7 +274,9 @@ async def search_by_image_endpoint(
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
 
     try:
-        results = service.search_service.search_by_image_A(img, k=top_k)
+        # Solo CLIP sale del event loop: las búsquedas concurrentes se agrupan en una pasada
+        query_embedding, _ = await _encode_query_image(service, img)
+        results = service.search_service.search_by_image_A(img, k=top_k, query_embedding=query_embedding)
 
         execution_time = (time.time() - start_time) * 1000
 
@@ -414,7 +446,8 @@ async def hybrid_image_search_endpoint(
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
 
     try:
-        results = service.search_service.hydrid_search_image_A(img, k=top_k, peso_imagen=peso_imagen, peso_caption=peso_caption, peso_description=peso_description, umbral=umbral)
+        query_embedding, caption = await _encode_query_image(service, img, with_caption=True)
+        results = service.search_service.hydrid_search_image_A(img, k=top_k, peso_imagen=peso_imagen, peso_caption=peso_caption, peso_description=peso_description, umbral=umbral, query_embedding=query_embedding, caption=caption)
 
         execution_time = (time.time() - start_time) * 1000
         out_results: List[HybridSearchResultImage] = []
@@ -492,7 +525,8 @@ async def hybrid_image_description_endpoint(
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
 
     try:
-        results = service.search_service.hybrid_search_image_description_A(img, query=query, k=top_k, peso_imagen=peso_imagen, peso_caption=peso_caption, peso_description=peso_description, umbral=umbral)
+        query_embedding, caption = await _encode_query_image(service, img, with_caption=True)
+        results = service.search_service.hybrid_search_image_description_A(img, query=query, k=top_k, peso_imagen=peso_imagen, peso_caption=peso_caption, peso_description=peso_description, umbral=umbral, query_embedding=query_embedding, caption=caption)
 
         execution_time = (time.time() - start_time) * 1000
         out_results: List[HybridSearchResultImage] = []
@@ -594,7 +628,9 @@ async def health_check(request: Request):
         
         # Determine overall status
         status_value = "healthy"
-        if any(status == "error" for status in dependencies.values()):
+        if dependencies["product_service"] == "starting":
+            status_value = "starting"
+        elif any(status == "error" for status in dependencies.values()):
             status_value = "unhealthy"
         elif any(status in ["unknown", "not_configured"] for status in dependencies.values()):
             status_value = "degraded"
@@ -714,17 +750,16 @@ async def rrf_search(
         execution_time = (time.time() - start_time) * 1000
         
         # Build response
+        products = service.get_products_by_ids(product_ids) if include_product_details else [None] * len(product_ids)
         results = []
-        for i, product_id in enumerate(product_ids):
+        for i, (product_id, product) in enumerate(zip(product_ids, products)):
             result = SearchResult(
                 product_id=product_id,
                 score=1.0 / (i + 1)  # Simple ranking score
             )
             
-            if include_product_details:
-                product = service.get_product_by_id(product_id)
-                if product:
-                    result.product = product_to_response(product)
+            if product:
+                result.product = product_to_response(product)
             
             results.append(result)
         
@@ -774,17 +809,16 @@ async def strategy_search(
         # Build response
         results = []
         product_ids = result_dict.get("results", [])
+        products = service.get_products_by_ids(product_ids) if search_request.include_product_details else [None] * len(product_ids)
         
-        for i, product_id in enumerate(product_ids):
+        for i, (product_id, product) in enumerate(zip(product_ids, products)):
             result = SearchResult(
                 product_id=product_id,
                 score=1.0 / (i + 1)  # Simple ranking score
             )
             
-            if search_request.include_product_details:
-                product = service.get_product_by_id(product_id)
-                if product:
-                    result.product = product_to_response(product)
+            if product:
+                result.product = product_to_response(product)
             
             results.append(result)
         
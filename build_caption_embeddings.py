@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Precompute the embeddings of the catalog captions
+
+Run once (requires OPENAI_API_KEY) and whenever products.jsonl or the
+embedding model change. /api/v1/products/load-from-json memory-maps the
+resulting captions_fp16.npy instead of embedding every caption again.
+"""
+
+import json
+import sys
+import numpy as np
+from dotenv import load_dotenv
+
+from core.config.settings import settings
+from core.services.embedding_service import EmbeddingService
+from data.productos_del_json_copy import (
+    CAPTIONS,
+    CAPTION_EMBEDDINGS_PATH,
+    CAPTION_EMBEDDINGS_META_PATH,
+    captions_digest
+)
+
+# Load environment variables
+load_dotenv()
+
+def main():
+    captions = CAPTIONS.tolist()
+    print(f"Embedding {len(captions)} captions with {settings.OPENAI_MODEL}...")
+
+    # One batched request for the whole catalog
+    embeddings = np.asarray(EmbeddingService().generate_embeddings_batch(captions), dtype=np.float16)
+    # The batch call drops blank captions; the .npy is read by row, so it must match CAPTIONS one to one
+    if len(embeddings) != len(captions):
+        print(f"❌ Got {len(embeddings)} embeddings for {len(captions)} captions (blank captions?), nothing saved")
+        sys.exit(1)
+    np.save(CAPTION_EMBEDDINGS_PATH, embeddings)
+
+    with open(CAPTION_EMBEDDINGS_META_PATH, "w", encoding="utf-8") as f:
+        json.dump({
+            "model": settings.OPENAI_MODEL,
+            "sha256": captions_digest(settings.OPENAI_MODEL),
+            "count": embeddings.shape[0],
+            "dimension": embeddings.shape[1]
+        }, f, indent=2)
+    print(f"✅ Saved {embeddings.shape} embeddings to {CAPTION_EMBEDDINGS_PATH}")
+
+if __name__ == "__main__":
+    main()
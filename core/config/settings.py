@@ -19,18 +19,39 @@ class Settings:
     DEFAULT_VECTOR_WEIGHT: float = float(os.getenv("DEFAULT_VECTOR_WEIGHT", "0.6"))
     
     # BM25 Configuration
-    BM25_K1: float = float(os.getenv("BM25_K1", "1.2"))
+    BM25_K1: float = float(os.getenv("BM25_K1", "1.5"))  # 1.5 = rank_bm25's default, the ranking the index always had
     BM25_B: float = float(os.getenv("BM25_B", "0.75"))
     
     # Vector Store Configuration
     VECTOR_STORE_PATH: str = os.getenv("VECTOR_STORE_PATH", "data/vector_store")
     VECTOR_STORE_PATH_IMG: str = os.getenv("VECTOR_STORE_PATH_IMG", "data/image_store")
     VECTOR_DIMENSION: int = int(os.getenv("VECTOR_DIMENSION", "1536"))  # OpenAI embedding dimension
+    VECTOR_QUANTIZATION: str = os.getenv("VECTOR_QUANTIZATION", "fp16")  # "fp16", "int8" or "none" (float32)
     
     # Performance Configuration
     BATCH_SIZE: int = int(os.getenv("BATCH_SIZE", "100"))
     MAX_RETRIES: int = int(os.getenv("MAX_RETRIES", "3"))
     
+    # Semantic Query Cache Configuration
+    SEMANTIC_CACHE_ENABLED: bool = os.getenv("SEMANTIC_CACHE_ENABLED", "true").lower() == "true"
+    SEMANTIC_CACHE_THRESHOLD: float = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.97"))
+    SEMANTIC_CACHE_TTL: float = float(os.getenv("SEMANTIC_CACHE_TTL", "3600"))  # seconds, 0 = no expiry
+    SEMANTIC_CACHE_MAX_ENTRIES: int = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "1000"))
+    # hybrid/rrf mix in BM25 scores of the exact query text, so a paraphrase hit would return
+    # another query's keyword ranking; only pure semantic search is cached unless listed here
+    SEMANTIC_CACHE_SEARCH_TYPES: List[str] = [
+        t.strip() for t in os.getenv("SEMANTIC_CACHE_SEARCH_TYPES", "semantic").split(",") if t.strip()
+    ]
+    QUERY_EMBEDDING_CACHE_SIZE: int = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "1024"))  # 0 disables
+    
+    # Query-image micro-batching (one CLIP forward pass for concurrent image searches)
+    IMAGE_BATCH_SIZE: int = int(os.getenv("IMAGE_BATCH_SIZE", "16"))
+    IMAGE_BATCH_WAIT_MS: float = float(os.getenv("IMAGE_BATCH_WAIT_MS", "10"))
+    
+    # Persistent Embedding Cache Configuration
+    EMBEDDING_CACHE_ENABLED: bool = os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+    EMBEDDING_CACHE_PATH: str = os.getenv("EMBEDDING_CACHE_PATH", "data/embedding_cache.db")
+    
     @classmethod
     def validate_openai_key(cls) -> bool:
         """Validate that OpenAI API key is configured."""
@@ -1,21 +1,110 @@
+import sys
+from collections import Counter
 from typing import List, Tuple, Optional, Dict
-from langchain_community.retrievers import BM25Retriever
-from langchain.schema import Document
+import numpy as np
+from scipy import sparse
 from ..models.product import Product, ProductDocument
 from ..config.settings import settings
 import logging
 
+try:
+    import numba
+except ImportError:  # numba is optional, scoring falls back to NumPy
+    numba = None
+
 logger = logging.getLogger(__name__)
 
+# Floor for negative IDF values, as a fraction of the average IDF (Okapi BM25 / rank_bm25)
+BM25_EPSILON = 0.25
+
+
+def _accumulate_scores_numpy(
+    term_ids: np.ndarray,
+    term_ptr: np.ndarray,
+    post_docs: np.ndarray,
+    post_tf: np.ndarray,
+    idf: np.ndarray,
+    doc_norm: np.ndarray,
+    k1: float,
+    n_docs: int
+) -> np.ndarray:
+    """Sum BM25 contributions of the query terms over their posting lists."""
+    scores = np.zeros(n_docs, dtype=np.float32)
+    for term_id in term_ids:
+        start, end = term_ptr[term_id], term_ptr[term_id + 1]
+        docs = post_docs[start:end]
+        tf = post_tf[start:end]
+        scores[docs] += idf[term_id] * (tf * (k1 + 1.0)) / (tf + doc_norm[docs])
+    return scores
+
+
+if numba is not None:
+    @numba.njit(cache=True, fastmath=True)
+    def _accumulate_scores_jit(term_ids, term_ptr, post_docs, post_tf, idf, doc_norm, k1, n_docs):
+        scores = np.zeros(n_docs, dtype=np.float32)
+        for i in range(term_ids.shape[0]):
+            term_id = term_ids[i]
+            weight = idf[term_id]
+            for p in range(term_ptr[term_id], term_ptr[term_id + 1]):
+                doc = post_docs[p]
+                tf = post_tf[p]
+                scores[doc] += weight * (tf * (k1 + 1.0)) / (tf + doc_norm[doc])
+        return scores
+    
+    _accumulate_scores = _accumulate_scores_jit
+else:
+    _accumulate_scores = _accumulate_scores_numpy
+
+
+def _top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores in descending order (O(N) selection + O(k log k) sort)."""
+    if k >= scores.shape[0]:
+        return np.argsort(-scores, kind="stable")
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+def _top_k_indices_rows(scores: np.ndarray, k: int) -> np.ndarray:
+    """Row-wise version of _top_k_indices for a (n_queries, n_docs) score matrix."""
+    if k >= scores.shape[1]:
+        return np.argsort(-scores, axis=1, kind="stable")
+    candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(scores, candidates, axis=1), axis=1, kind="stable")
+    return np.take_along_axis(candidates, order, axis=1)
+
 
 class BM25Repository:
     """Repository for managing BM25 keyword search operations."""
     
     def __init__(self):
         """Initialize the BM25 repository."""
-        self.retriever: Optional[BM25Retriever] = None
         self.products: Dict[str, Product] = {}  # product_id -> Product
         self.documents: List[ProductDocument] = []
+        self.k1 = settings.BM25_K1
+        self.b = settings.BM25_B
+        self._reset_postings()
+    
+    def _reset_postings(self) -> None:
+        """Reset the compiled BM25 postings to an empty index."""
+        self._doc_ids: List[str] = []  # row -> product_id
+        self._vocabulary: Dict[str, int] = {}  # term -> term_id
+        self._term_ptr = np.zeros(1, dtype=np.int64)  # CSR offsets into the posting arrays
+        self._post_docs = np.zeros(0, dtype=np.int32)
+        self._post_tf = np.zeros(0, dtype=np.float32)
+        self._idf = np.zeros(0, dtype=np.float32)
+        self._doc_norm = np.zeros(0, dtype=np.float32)  # k1 * (1 - b + b * len / avgdl)
+        self._term_doc_weights: Optional[sparse.csr_matrix] = None  # (terms x docs) BM25 weights
+        self._term_counts: Dict[str, Tuple[str, Counter, int]] = {}  # product_id -> (text, tf, length)
+    
+    @staticmethod
+    def _tokenize(text: str) -> List[str]:
+        """
+        Split text into BM25 terms (whitespace tokenization).
+        
+        Terms are interned: the cached per-document Counters share one string per distinct term,
+        and vocabulary lookups of equal terms hit the identity fast path.
+        """
+        return [sys.intern(token) for token in text.split()]
     
     def create_index(self, products: List[Product]) -> None:
         """
@@ -36,9 +125,8 @@ class BM25Repository:
         self.documents = [ProductDocument(product) for product in products]
         self.products = {product.id: product for product in products}
         
-        # Create BM25 retriever
-        self.retriever = BM25Retriever.from_documents(self.documents)
-        self.retriever.k = settings.DEFAULT_TOP_K
+        # Compile postings
+        self.rebuild_index()
         
         logger.info(f"Successfully created BM25 index with {len(products)} products")
     
@@ -66,6 +154,53 @@ class BM25Repository:
         
         logger.info(f"Successfully added product {product.id} to BM25 index")
     
+    def add_products(self, products: List[Product]) -> None:
+        """
+        Append several products to the BM25 index with a single rebuild.
+        
+        Args:
+            products: Products to add
+            
+        Raises:
+            ValueError: If any product already exists
+        """
+        for product in products:
+            if product.id in self.products:
+                raise ValueError(f"Product with ID {product.id} already exists")
+        
+        logger.info(f"Adding {len(products)} products to BM25 index")
+        
+        for product in products:
+            self.products[product.id] = product
+            self.documents.append(ProductDocument(product))
+        
+        self.rebuild_index()
+        
+        logger.info(f"Successfully added {len(products)} products to BM25 index")
+    
+    def upsert_products(self, products: List[Product]) -> None:
+        """
+        Add new products and update existing ones with a single rebuild.
+        
+        Args:
+            products: Products to insert or update
+        """
+        logger.info(f"Upserting {len(products)} products into BM25 index")
+        
+        positions = {doc.product_id: i for i, doc in enumerate(self.documents)}
+        for product in products:
+            document = ProductDocument(product)
+            if product.id in positions:
+                self.documents[positions[product.id]] = document
+            else:
+                positions[product.id] = len(self.documents)
+                self.documents.append(document)
+            self.products[product.id] = product
+        
+        self.rebuild_index()
+        
+        logger.info(f"Successfully upserted {len(products)} products into BM25 index")
+    
     def update_product(self, product: Product) -> None:
         """
         Update an existing product in the BM25 index.
@@ -138,44 +273,126 @@ class BM25Repository:
         if not query or not query.strip():
             raise ValueError("Query cannot be empty")
         
-        if self.retriever is None or not self.documents:
+        if not self._doc_ids:
             logger.warning("BM25 index is empty")
             return []
         
-        # Set the number of results to return
-        original_k = self.retriever.k
-        self.retriever.k = min(k, len(self.documents))
+        # Unknown terms contribute nothing; repeated terms count once per occurrence
+        term_ids = np.array(
+            [self._vocabulary[term] for term in self._tokenize(query.strip()) if term in self._vocabulary],
+            dtype=np.int64
+        )
+        scores = _accumulate_scores(
+            term_ids, self._term_ptr, self._post_docs, self._post_tf,
+            self._idf, self._doc_norm, np.float32(self.k1), len(self._doc_ids)
+        )
+        
+        top_rows = _top_k_indices(scores, min(k, len(self._doc_ids)))
         
-        try:
-            # Get relevant documents
-            docs = self.retriever.invoke(query.strip())
+        # Fusion code expects rank-based scores, so keep assigning decreasing scores
+        return [(self._doc_ids[row], 1.0 / rank) for rank, row in enumerate(top_rows, start=1)]
+    
+    def search_keywords_batch(self, queries: List[str], k: int = 10) -> List[List[Tuple[str, float]]]:
+        """
+        Search several queries at once with a single sparse matrix product.
+        
+        Args:
+            queries: Search queries
+            k: Number of results to return per query
             
-            # Convert to product IDs with scores
-            results = []
-            for doc in docs:
-                product_id = doc.metadata.get("product_id")
-                if product_id:
-                    # BM25 doesn't return explicit scores, so we assign decreasing scores
-                    score = 1.0 / (len(results) + 1)
-                    results.append((product_id, score))
+        Returns:
+            One list of (product_id, relevance_score) tuples per query, in input order
             
-            return results
+        Raises:
+            ValueError: If any query is empty
+        """
+        if any(not query or not query.strip() for query in queries):
+            raise ValueError("Query cannot be empty")
+        
+        if not self._doc_ids:
+            logger.warning("BM25 index is empty")
+            return [[] for _ in queries]
+        
+        # Query-term count matrix (queries x terms); duplicates are summed like in search_keywords
+        rows, cols = [], []
+        for row, query in enumerate(queries):
+            for term in self._tokenize(query.strip()):
+                term_id = self._vocabulary.get(term)
+                if term_id is not None:
+                    rows.append(row)
+                    cols.append(term_id)
+        query_terms = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float32), (rows, cols)),
+            shape=(len(queries), len(self._vocabulary))
+        )
+        
+        scores = (query_terms @ self._term_doc_weights).toarray()
+        top_rows = _top_k_indices_rows(scores, min(k, len(self._doc_ids)))
         
-        finally:
-            # Restore original k value
-            self.retriever.k = original_k
+        return [
+            [(self._doc_ids[row], 1.0 / rank) for rank, row in enumerate(query_rows, start=1)]
+            for query_rows in top_rows
+        ]
     
     def rebuild_index(self) -> None:
-        """Rebuild the BM25 index from current documents."""
+        """Rebuild the BM25 postings from current documents."""
         if not self.documents:
-            self.retriever = None
+            self._reset_postings()
             return
         
         logger.info("Rebuilding BM25 index")
         
-        # Create new retriever with current documents
-        self.retriever = BM25Retriever.from_documents(self.documents)
-        self.retriever.k = settings.DEFAULT_TOP_K
+        vocabulary: Dict[str, int] = {}
+        postings: List[List[Tuple[int, int]]] = []  # term_id -> [(row, tf)]
+        doc_lengths = np.empty(len(self.documents), dtype=np.float32)
+        
+        term_counts: Dict[str, Tuple[str, Counter, int]] = {}
+        
+        for row, doc in enumerate(self.documents):
+            # Only documents added or changed since the last rebuild are tokenized again
+            cached = self._term_counts.get(doc.product_id)
+            if cached is None or cached[0] != doc.page_content:
+                tokens = self._tokenize(doc.page_content)
+                cached = (doc.page_content, Counter(tokens), len(tokens))
+            term_counts[doc.product_id] = cached
+            doc_lengths[row] = cached[2]
+            for term, tf in cached[1].items():
+                term_id = vocabulary.setdefault(term, len(vocabulary))
+                if term_id == len(postings):
+                    postings.append([])
+                postings[term_id].append((row, tf))
+        
+        # Flatten postings into CSR arrays (term-major, rows ascending)
+        lengths = np.fromiter((len(p) for p in postings), dtype=np.int64, count=len(postings))
+        term_ptr = np.zeros(len(postings) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=term_ptr[1:])
+        flat = np.array([entry for p in postings for entry in p], dtype=np.int64).reshape(-1, 2)
+        
+        # Okapi IDF with an epsilon floor for terms present in more than half the documents
+        n_docs = len(self.documents)
+        idf = np.log(n_docs - lengths + 0.5) - np.log(lengths + 0.5)
+        idf[idf < 0] = BM25_EPSILON * idf.mean()
+        
+        avgdl = float(doc_lengths.mean()) or 1.0
+        
+        self._doc_ids = [doc.product_id for doc in self.documents]
+        self._term_counts = term_counts
+        self._vocabulary = vocabulary
+        self._term_ptr = term_ptr
+        self._post_docs = flat[:, 0].astype(np.int32)
+        self._post_tf = flat[:, 1].astype(np.float32)
+        self._idf = idf.astype(np.float32)
+        self._doc_norm = (self.k1 * (1.0 - self.b + self.b * doc_lengths / avgdl)).astype(np.float32)
+        
+        # Same postings as a (terms x docs) CSR matrix of final BM25 weights for batched scoring
+        posting_terms = np.repeat(np.arange(len(postings)), lengths)
+        posting_weights = self._idf[posting_terms] * (self._post_tf * (self.k1 + 1.0)) / (
+            self._post_tf + self._doc_norm[self._post_docs]
+        )
+        self._term_doc_weights = sparse.csr_matrix(
+            (posting_weights.astype(np.float32), self._post_docs, term_ptr),
+            shape=(len(postings), n_docs)
+        )
         
         logger.info(f"Successfully rebuilt BM25 index with {len(self.documents)} documents")
     
@@ -194,7 +411,7 @@ class BM25Repository:
     def clear_index(self) -> None:
         """Clear the entire BM25 index."""
         logger.info("Clearing BM25 index")
-        self.retriever = None
         self.products.clear()
         self.documents.clear()
-        logger.info("Successfully cleared BM25 index") 
\ No newline at end of file
+        self._reset_postings()
+        logger.info("Successfully cleared BM25 index") 
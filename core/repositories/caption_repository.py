@@ -105,6 +105,57 @@ class CaptionRepository:
 
         logger.info(f"Successfully added caption {product.id} to FAISS index")
 
+    def add_captions(self, products: List[Product], captions: List[str], embeddings: Optional[np.ndarray] = None) -> None:
+        """
+        Add several captions with one embeddings request and a single FAISS add.
+
+        Args:
+            products: Products the captions belong to
+            captions: Caption of each product (aligned with products)
+            embeddings: Precomputed caption embeddings aligned with products (optional)
+        """
+        for product in products:
+            if product.id in self.products:
+                raise ValueError(f"Caption with ID {product.id} already exists")
+
+        # Same as add_caption: products without a caption are skipped
+        rows = []
+        for i, (product, caption) in enumerate(zip(products, captions)):
+            if caption and caption.strip():
+                rows.append(i)
+            else:
+                logger.warning(f"No caption generated for product {product.id}")
+        if not rows:
+            return
+
+        logger.info(f"Adding {len(rows)} captions to FAISS index")
+
+        if embeddings is None:
+            embeddings_array = np.array(
+                self.embedding_service.generate_embeddings_batch([captions[i] for i in rows]), dtype=np.float32
+            )
+        else:
+            embeddings = np.asarray(embeddings, dtype=np.float32)
+            if len(embeddings) != len(products):
+                raise ValueError(f"Got {len(embeddings)} caption embeddings for {len(products)} products")
+            embeddings_array = embeddings[rows]
+
+        # FAISS rows are mapped to products by position, a short batch would shift every ID after the gap
+        if len(embeddings_array) != len(rows):
+            raise ValueError(f"Got {len(embeddings_array)} caption embeddings for {len(rows)} captions")
+
+        self._initialize_index()
+        self.index.add(embeddings_array)
+
+        for i in rows:
+            product = products[i]
+            self.product_id_map[self._next_index] = product.id
+            self.id_to_index_map[product.id] = self._next_index
+            self.products[product.id] = product
+            self._next_index += 1
+
+        logger.info(f"Successfully added {len(rows)} captions to FAISS index")
+
     def update_caption(self, product: Product) -> None:
         """
         Update an existing caption's embedding/metadata. For FAISS we rebuild the index.
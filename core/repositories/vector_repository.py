@@ -14,6 +14,9 @@ logger = logging.getLogger(__name__)
 class VectorRepository:
     """Repository for managing FAISS vector store operations."""
     
+    # Compact the index once this fraction of its rows are tombstones
+    COMPACTION_RATIO = 0.25
+    
     def __init__(self):
         """Initialize the vector repository."""
         self.embedding_service = EmbeddingService()
@@ -26,19 +29,63 @@ class VectorRepository:
         # Create vector store directory
         settings.create_vector_store_dir()
     
+    @staticmethod
+    def _create_faiss_index(dimension: int) -> faiss.Index:
+        """Create an empty inner-product index using the configured vector storage."""
+        quantization = settings.VECTOR_QUANTIZATION.lower()
+        if quantization == "fp16":
+            # Half-precision storage: half the memory traffic per query, negligible cosine error
+            return faiss.IndexScalarQuantizer(
+                dimension, faiss.ScalarQuantizer.QT_fp16, faiss.METRIC_INNER_PRODUCT
+            )
+        if quantization == "int8":
+            # One byte per component, a quarter of float32. A single [min, max] range is shared by every
+            # dimension and learned from the first vectors added, widened by 10% (see _add_vectors)
+            index = faiss.IndexScalarQuantizer(
+                dimension, faiss.ScalarQuantizer.QT_8bit_uniform, faiss.METRIC_INNER_PRODUCT
+            )
+            index.sq.rangestat_arg = 0.1
+            return index
+        if quantization == "none":
+            return faiss.IndexFlatIP(dimension)
+        raise ValueError(
+            f"Invalid VECTOR_QUANTIZATION: {settings.VECTOR_QUANTIZATION}. Must be 'fp16', 'int8' or 'none'"
+        )
+    
+    def _add_vectors(self, vectors: np.ndarray) -> None:
+        """Append unit vectors to the index, training the quantizer on them first if it needs it (int8)."""
+        if not self.index.is_trained:
+            self.index.train(vectors)
+        self.index.add(vectors)
+    
     def _initialize_index(self) -> None:
         """Initialize FAISS index if not already created."""
         if self.index is None:
-            # Use L2 distance for similarity search
-            self.index = faiss.IndexFlatL2(settings.VECTOR_DIMENSION)
-            logger.info(f"Initialized FAISS index with dimension {settings.VECTOR_DIMENSION}")
+            # Inner product over unit vectors = cosine similarity (one GEMV per query)
+            self.index = self._create_faiss_index(settings.VECTOR_DIMENSION)
+            logger.info(
+                f"Initialized FAISS index with dimension {settings.VECTOR_DIMENSION} "
+                f"({settings.VECTOR_QUANTIZATION} storage)"
+            )
+    
+    @staticmethod
+    def _to_unit_vectors(embeddings: List[List[float]]) -> np.ndarray:
+        """Convert embeddings to a contiguous float32 matrix of L2-normalized rows."""
+        embeddings_array = np.ascontiguousarray(embeddings, dtype=np.float32)
+        faiss.normalize_L2(embeddings_array)
+        return embeddings_array
     
-    def create_index(self, products: List[Product]) -> None:
+    def create_index(
+        self,
+        products: List[Product],
+        embeddings: Optional[List[List[float]]] = None
+    ) -> None:
         """
         Create FAISS index from a list of products.
         
         Args:
             products: List of products to index
+            embeddings: Precomputed embeddings aligned with products (generated if not provided)
             
         Raises:
             ValueError: If products list is empty
@@ -50,17 +97,20 @@ class VectorRepository:
         logger.info(f"Creating FAISS index for {len(products)} products")
         
         # Generate embeddings for all products
-        texts = [product.get_combined_text() for product in products]
-        embeddings = self.embedding_service.generate_embeddings_batch(texts)
+        if embeddings is None:
+            texts = [product.get_combined_text() for product in products]
+            embeddings = self.embedding_service.generate_embeddings_batch(texts)
+        elif len(embeddings) != len(products):
+            raise ValueError("Embeddings count does not match products count")
         
         # Initialize index
         self._initialize_index()
         
-        # Convert embeddings to numpy array
-        embeddings_array = np.array(embeddings, dtype=np.float32)
+        # Normalize once at index time so queries only need a dot product
+        embeddings_array = self._to_unit_vectors(embeddings)
         
         # Add embeddings to FAISS index
-        self.index.add(embeddings_array)
+        self._add_vectors(embeddings_array)
         
         # Update mappings
         for i, product in enumerate(products):
@@ -94,11 +144,11 @@ class VectorRepository:
         # Generate embedding
         embedding = self.embedding_service.generate_embedding(product.get_combined_text())
         
-        # Convert to numpy array
-        embedding_array = np.array([embedding], dtype=np.float32)
+        # Convert to normalized numpy array
+        embedding_array = self._to_unit_vectors([embedding])
         
         # Add to FAISS index
-        self.index.add(embedding_array)
+        self._add_vectors(embedding_array)
         
         # Update mappings
         faiss_index = self._next_index
@@ -125,15 +175,83 @@ class VectorRepository:
         
         logger.info(f"Updating product {product.id} in FAISS index")
         
-        # For FAISS, we need to rebuild the index for updates
-        # Store the updated product
+        previous = self.products[product.id]
+        if previous.get_combined_text() == product.get_combined_text():
+            # Embedded text is unchanged, the stored vector is still valid
+            self.products[product.id] = product
+            logger.info(f"Product {product.id} text unchanged, kept existing embedding")
+            return
+        
+        # Embed only the updated product; its old row becomes a tombstone
+        embedding = self.embedding_service.generate_embedding(product.get_combined_text())
+        self._tombstone(product.id)
+        
+        self._add_vectors(self._to_unit_vectors([embedding]))
+        faiss_index = self._next_index
+        self.product_id_map[faiss_index] = product.id
+        self.id_to_index_map[product.id] = faiss_index
         self.products[product.id] = product
+        self._next_index += 1
         
-        # Rebuild the entire index
-        self._rebuild_index()
+        self._maybe_compact_index()
         
         logger.info(f"Successfully updated product {product.id} in FAISS index")
     
+    def upsert_products(
+        self,
+        products: List[Product],
+        embeddings: Optional[List[List[float]]] = None
+    ) -> int:
+        """
+        Add new products and update existing ones, embedding only what changed.
+        
+        Args:
+            products: Products to insert or update
+            embeddings: Precomputed embeddings aligned with products (generated if not provided)
+            
+        Returns:
+            Number of products whose vector was added or replaced
+            
+        Raises:
+            ValueError: If embeddings count does not match products count
+            Exception: If embedding generation fails
+        """
+        if embeddings is not None and len(embeddings) != len(products):
+            raise ValueError("Embeddings count does not match products count")
+        
+        changed = []
+        changed_embeddings = []
+        for i, product in enumerate(products):
+            previous = self.products.get(product.id)
+            if previous is not None and previous.get_combined_text() == product.get_combined_text():
+                # Embedded text is unchanged, the stored vector is still valid
+                self.products[product.id] = product
+            else:
+                changed.append(product)
+                if embeddings is not None:
+                    changed_embeddings.append(embeddings[i])
+        
+        if not changed:
+            logger.info(f"Upserted {len(products)} products, no embeddings needed")
+            return 0
+        
+        if embeddings is None:
+            texts = [product.get_combined_text() for product in changed]
+            embeddings = self.embedding_service.generate_embeddings_batch(texts)
+        else:
+            embeddings = changed_embeddings
+        
+        # Old rows of re-embedded products become tombstones
+        for product in changed:
+            if product.id in self.id_to_index_map:
+                self._tombstone(product.id)
+        
+        self.create_index(changed, embeddings=embeddings)
+        self._maybe_compact_index()
+        
+        logger.info(f"Upserted {len(products)} products, embedded {len(changed)}")
+        return len(changed)
+    
     def delete_product(self, product_id: str) -> None:
         """
         Delete a product from the FAISS index.
@@ -149,24 +267,22 @@ class VectorRepository:
         
         logger.info(f"Deleting product {product_id} from FAISS index")
         
-        # Remove from mappings
-        faiss_index = self.id_to_index_map[product_id]
-        del self.product_id_map[faiss_index]
-        del self.id_to_index_map[product_id]
+        # Remove from mappings, leaving a tombstone row in the FAISS matrix
+        self._tombstone(product_id)
         del self.products[product_id]
         
-        # Rebuild the index without the deleted product
-        self._rebuild_index()
+        self._maybe_compact_index()
         
         logger.info(f"Successfully deleted product {product_id} from FAISS index")
     
-    def search_similar(self, query: str, k: int = 10) -> List[Tuple[str, float]]:
+    def search_similar(self, query: str, k: int = 10, query_embedding: Optional[List[float]] = None) -> List[Tuple[str, float]]:
         """
         Search for similar products using vector similarity.
         
         Args:
             query: Search query
             k: Number of results to return
+            query_embedding: Precomputed embedding of the query (skips the OpenAI call)
             
         Returns:
             List of (product_id, similarity_score) tuples
@@ -183,41 +299,104 @@ class VectorRepository:
             return []
         
         # Generate query embedding
-        query_embedding = self.embedding_service.generate_embedding(query.strip())
-        query_array = np.array([query_embedding], dtype=np.float32)
+        if query_embedding is None:
+            query_embedding = self.embedding_service.generate_embedding(query.strip())
+        query_array = self._to_unit_vectors([query_embedding])
         
-        # Search in FAISS index
-        k = min(k, self.index.ntotal)  # Don't search for more than available
-        distances, indices = self.index.search(query_array, k)
+        # Search in FAISS index, over-fetching by the number of tombstone rows
+        search_k = min(k + self._tombstone_count(), self.index.ntotal)
+        similarities, indices = self.index.search(query_array, search_k)
         
         # Convert results to product IDs and scores
         results = []
-        for i, (distance, faiss_index) in enumerate(zip(distances[0], indices[0])):
+        for i, (cosine, faiss_index) in enumerate(zip(similarities[0], indices[0])):
             if faiss_index in self.product_id_map:
                 product_id = self.product_id_map[faiss_index]
-                # Convert L2 distance to similarity score (lower distance = higher similarity)
+                # For unit vectors the squared L2 distance is 2 - 2*cos; keep the
+                # historical 1 / (1 + distance) score scale used by the fusion code
+                distance = max(0.0, 2.0 - 2.0 * float(cosine))
                 similarity_score = 1.0 / (1.0 + distance)
                 results.append((product_id, similarity_score))
+                if len(results) == k:
+                    break
         
         return results
     
-    def _rebuild_index(self) -> None:
-        """Rebuild the FAISS index from current products."""
-        if not self.products:
+    def search_similar_batch(self, queries: List[str], k: int = 10) -> List[List[Tuple[str, float]]]:
+        """
+        Search several queries with one embeddings request and one FAISS search.
+        
+        Args:
+            queries: Search queries
+            k: Number of results to return per query
+            
+        Returns:
+            One list of (product_id, similarity_score) tuples per query, in input order
+            
+        Raises:
+            ValueError: If any query is empty
+            Exception: If embedding generation fails
+        """
+        if any(not query or not query.strip() for query in queries):
+            raise ValueError("Query cannot be empty")
+        
+        if self.index is None or self.index.ntotal == 0:
+            logger.warning("FAISS index is empty")
+            return [[] for _ in queries]
+        
+        query_embeddings = self.embedding_service.generate_embeddings_batch([query.strip() for query in queries])
+        query_matrix = self._to_unit_vectors(query_embeddings)
+        
+        search_k = min(k + self._tombstone_count(), self.index.ntotal)
+        similarities, indices = self.index.search(query_matrix, search_k)
+        
+        batch_results = []
+        for row_similarities, row_indices in zip(similarities, indices):
+            results = []
+            for cosine, faiss_index in zip(row_similarities, row_indices):
+                if faiss_index in self.product_id_map:
+                    distance = max(0.0, 2.0 - 2.0 * float(cosine))
+                    results.append((self.product_id_map[faiss_index], 1.0 / (1.0 + distance)))
+                    if len(results) == k:
+                        break
+            batch_results.append(results)
+        
+        return batch_results
+    
+    def _tombstone(self, product_id: str) -> None:
+        """Unmap a product's FAISS row so searches skip it until the next compaction."""
+        faiss_index = self.id_to_index_map.pop(product_id)
+        del self.product_id_map[faiss_index]
+    
+    def _tombstone_count(self) -> int:
+        """Number of FAISS rows that no longer belong to a product."""
+        if self.index is None:
+            return 0
+        return self.index.ntotal - len(self.product_id_map)
+    
+    def _maybe_compact_index(self) -> None:
+        """Drop tombstone rows once they make up a significant part of the index."""
+        if not self.product_id_map:
+            # Nothing left to search
             self.index = None
             self.product_id_map.clear()
             self.id_to_index_map.clear()
             self._next_index = 0
             return
         
-        # Clear mappings
-        self.product_id_map.clear()
-        self.id_to_index_map.clear()
-        self._next_index = 0
+        if self._tombstone_count() <= self.COMPACTION_RATIO * self.index.ntotal:
+            return
+        
+        # remove_ids shifts the surviving rows down while keeping their order (flat and SQ indexes)
+        live_positions = sorted(self.product_id_map)
+        dead_positions = np.setdiff1d(np.arange(self.index.ntotal, dtype=np.int64), live_positions)
+        self.index.remove_ids(dead_positions)
         
-        # Rebuild index
-        products_list = list(self.products.values())
-        self.create_index(products_list)
+        self.product_id_map = {new: self.product_id_map[old] for new, old in enumerate(live_positions)}
+        self.id_to_index_map = {product_id: new for new, product_id in self.product_id_map.items()}
+        self._next_index = self.index.ntotal
+        
+        logger.info(f"Compacted FAISS index: removed {len(dead_positions)} tombstone rows")
     
     def save_index(self, path: str = None) -> None:
         """
@@ -276,6 +455,13 @@ class VectorRepository:
             self.products = metadata["products"]
             self._next_index = metadata["next_index"]
             
+            # Indexes saved before cosine scoring used raw vectors with L2 distance
+            if self.index.metric_type == faiss.METRIC_L2:
+                vectors = self._to_unit_vectors(self.index.reconstruct_n(0, self.index.ntotal))
+                self.index = self._create_faiss_index(self.index.d)
+                self._add_vectors(vectors)
+                logger.info("Migrated legacy L2 FAISS index to normalized inner-product index")
+            
             logger.info(f"Loaded FAISS index from {path}")
         else:
             logger.info("No existing index found, starting fresh")
@@ -286,4 +472,9 @@ class VectorRepository:
     
     def get_product_by_id(self, product_id: str) -> Optional[Product]:
         """Get a product by its ID."""
-        return self.products.get(product_id) 
\ No newline at end of file
+        return self.products.get(product_id) 
+    
+    def get_products_by_ids(self, product_ids: List[str]) -> List[Optional[Product]]:
+        """Get several products by ID in one pass (None for unknown IDs, order preserved)."""
+        products = self.products
+        return [products.get(product_id) for product_id in product_ids] 
\ No newline at end of file
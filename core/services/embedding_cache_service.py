@@ -0,0 +1,120 @@
+"""
+Persistent Embedding Cache
+
+Stores OpenAI embeddings on disk (SQLite) keyed by sha256(model + text), so
+texts that were already embedded - the sample catalog of the demos, products
+re-indexed after a restart or an uvicorn reload - never hit the API again.
+"""
+
+import os
+import hashlib
+import sqlite3
+import threading
+from typing import List, Dict, Optional
+import numpy as np
+from ..config.settings import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    """Disk-backed embedding store shared by every process using the same file."""
+
+    def __init__(self, path: str = None, model: str = None):
+        """
+        Initialize the embedding cache.
+
+        Args:
+            path: SQLite database file (defaults to settings.EMBEDDING_CACHE_PATH)
+            model: Embedding model name, part of every key (defaults to settings)
+        """
+        self.path = path or settings.EMBEDDING_CACHE_PATH
+        self.model = model or settings.OPENAI_MODEL
+        self.hits = 0
+        self.misses = 0
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # One connection shared between threads (the batch pipeline embeds in workers)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+        self._connection.commit()
+
+    def _key(self, text: str) -> str:
+        """Cache key for a text under the configured model."""
+        return hashlib.sha256(f"{self.model}:{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, texts: List[str]) -> Dict[str, List[float]]:
+        """
+        Look up several texts at once.
+
+        Args:
+            texts: Texts to look up
+
+        Returns:
+            Dictionary text -> embedding for the texts found in the cache
+        """
+        keys = {self._key(text): text for text in texts}
+        found: Dict[str, List[float]] = {}
+        key_list = list(keys)
+
+        with self._lock:
+            # Stay below SQLite's bound-parameter limit
+            for i in range(0, len(key_list), 500):
+                chunk = key_list[i:i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._connection.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                for key, blob in rows:
+                    found[keys[key]] = np.frombuffer(blob, dtype=np.float32).tolist()
+
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def get(self, text: str) -> Optional[List[float]]:
+        """Look up a single text; returns None on a miss."""
+        return self.get_many([text]).get(text)
+
+    def put_many(self, texts: List[str], embeddings: List[List[float]]) -> None:
+        """
+        Store embeddings for several texts.
+
+        Args:
+            texts: Embedded texts
+            embeddings: Embeddings aligned with texts
+        """
+        rows = [
+            (self._key(text), np.asarray(embedding, dtype=np.float32).tobytes())
+            for text, embedding in zip(texts, embeddings)
+        ]
+        with self._lock:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)", rows
+            )
+            self._connection.commit()
+
+    def put(self, text: str, embedding: List[float]) -> None:
+        """Store the embedding of a single text."""
+        self.put_many([text], [embedding])
+
+    def clear(self) -> None:
+        """Delete every stored embedding."""
+        with self._lock:
+            self._connection.execute("DELETE FROM embeddings")
+            self._connection.commit()
+        logger.info("Cleared persistent embedding cache")
+
+    def get_statistics(self) -> Dict[str, int]:
+        """Get hit/miss counters and number of stored embeddings."""
+        with self._lock:
+            (entries,) = self._connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
@@ -2,6 +2,7 @@ import time
 from typing import List, Optional
 from openai import OpenAI
 from ..config.settings import settings
+from .embedding_cache_service import EmbeddingCache
 import logging
 
 logger = logging.getLogger(__name__)
@@ -18,6 +19,7 @@ class EmbeddingService:
         self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
         self.model = settings.OPENAI_MODEL
         self.max_retries = settings.MAX_RETRIES
+        self.cache = EmbeddingCache(model=self.model) if settings.EMBEDDING_CACHE_ENABLED else None
     
     def generate_embedding(self, text: str) -> List[float]:
         """
@@ -36,13 +38,21 @@ class EmbeddingService:
         if not text or not text.strip():
             raise ValueError("Text cannot be empty")
         
+        if self.cache is not None:
+            cached = self.cache.get(text.strip())
+            if cached is not None:
+                return cached
+        
         for attempt in range(self.max_retries):
             try:
                 response = self.client.embeddings.create(
                     model=self.model,
                     input=text.strip()
                 )
-                return response.data[0].embedding
+                embedding = response.data[0].embedding
+                if self.cache is not None:
+                    self.cache.put(text.strip(), embedding)
+                return embedding
             
             except Exception as e:
                 logger.warning(f"Embedding attempt {attempt + 1} failed: {e}")
@@ -72,12 +82,28 @@ class EmbeddingService:
         if not valid_texts:
             raise ValueError("No valid texts provided")
         
-        # Process in batches to avoid API limits
-        batch_size = min(settings.BATCH_SIZE, len(valid_texts))
-        embeddings = []
+        embeddings: List[Optional[List[float]]] = [None] * len(valid_texts)
+        
+        # Texts embedded before (this or a previous run) come from the persistent cache
+        cached = self.cache.get_many(valid_texts) if self.cache is not None else {}
+        pending = []
+        for position, text in enumerate(valid_texts):
+            if text in cached:
+                embeddings[position] = cached[text]
+            else:
+                pending.append(position)
+        
+        if not pending:
+            return embeddings
         
-        for i in range(0, len(valid_texts), batch_size):
-            batch = valid_texts[i:i + batch_size]
+        # Process in batches to avoid API limits. Batches are built from texts sorted
+        # by length so each request holds similarly sized inputs, then scattered back.
+        batch_size = min(settings.BATCH_SIZE, len(pending))
+        order = sorted(pending, key=lambda i: len(valid_texts[i]))
+        
+        for i in range(0, len(order), batch_size):
+            batch_positions = order[i:i + batch_size]
+            batch = [valid_texts[position] for position in batch_positions]
             
             for attempt in range(self.max_retries):
                 try:
@@ -85,8 +111,8 @@ class EmbeddingService:
                         model=self.model,
                         input=batch
                     )
-                    batch_embeddings = [item.embedding for item in response.data]
-                    embeddings.extend(batch_embeddings)
+                    for position, item in zip(batch_positions, response.data):
+                        embeddings[position] = item.embedding
                     break
                 
                 except Exception as e:
@@ -95,6 +121,12 @@ class EmbeddingService:
                         raise Exception(f"Failed to generate batch embeddings after {self.max_retries} attempts: {e}")
                     time.sleep(2 ** attempt)
         
+        if self.cache is not None:
+            self.cache.put_many(
+                [valid_texts[position] for position in pending],
+                [embeddings[position] for position in pending]
+            )
+        
         return embeddings
     
     def combine_title_description(self, title: str, description: str) -> str:
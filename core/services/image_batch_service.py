@@ -0,0 +1,112 @@
+"""
+Image Embedding Micro-Batcher
+
+Coalesces concurrent query-image embeddings into one CLIP forward pass.
+Callers block on encode(); a single worker thread collects the queued
+images (up to IMAGE_BATCH_SIZE, waiting at most IMAGE_BATCH_WAIT_MS after
+the first one) and encodes them together. Images that arrive while a batch
+is being encoded are picked up by the next batch.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List, Tuple
+import numpy as np
+from PIL import Image
+from ..config.settings import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ImageEmbeddingBatcher:
+    """Thread-safe micro-batcher in front of a batched image encoder."""
+
+    def __init__(
+        self,
+        encode_batch: Callable[[List[Image.Image]], np.ndarray],
+        max_batch_size: int = None,
+        max_wait_ms: float = None
+    ):
+        """
+        Initialize the batcher.
+
+        Args:
+            encode_batch: Function embedding a list of images into a (n, d) float32 array
+            max_batch_size: Maximum images per forward pass (defaults to settings.IMAGE_BATCH_SIZE)
+            max_wait_ms: Maximum time to wait for more images after the first one (defaults to settings)
+        """
+        self.encode_batch = encode_batch
+        self.max_batch_size = max_batch_size or settings.IMAGE_BATCH_SIZE
+        wait_ms = max_wait_ms if max_wait_ms is not None else settings.IMAGE_BATCH_WAIT_MS
+        self.max_wait = wait_ms / 1000.0
+        self.batches = 0
+        self.images = 0
+
+        self._queue: "queue.Queue[Tuple[Image.Image, Future]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker = None
+
+    def _ensure_worker(self) -> None:
+        """Start the worker thread on first use."""
+        if self._worker is None:
+            with self._lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(
+                        target=self._run, name="image-embedding-batcher", daemon=True
+                    )
+                    self._worker.start()
+
+    def submit(self, image: Image.Image) -> Future:
+        """
+        Queue an image for embedding.
+
+        Args:
+            image: RGB image to embed
+
+        Returns:
+            Future resolving to its (1, d) float32 embedding
+        """
+        self._ensure_worker()
+        future: Future = Future()
+        self._queue.put((image, future))
+        return future
+
+    def encode(self, image: Image.Image) -> np.ndarray:
+        """Embed one image, sharing the forward pass with concurrent callers."""
+        return self.submit(image).result()
+
+    def _collect(self) -> List[Tuple[Image.Image, Future]]:
+        """Block for the first queued image, then gather more until the batch is full or the window ends."""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            try:
+                remaining = deadline - time.monotonic()
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        """Worker loop: one encoder call per collected batch, results dispatched by position."""
+        while True:
+            batch = self._collect()
+            try:
+                embeddings = self.encode_batch([image for image, _ in batch])
+            except Exception as e:
+                logger.error(f"Image embedding batch of {len(batch)} failed: {e}")
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.images += len(batch)
+            for i, (_, future) in enumerate(batch):
+                future.set_result(embeddings[i:i + 1])
+
+    def get_statistics(self) -> dict:
+        """Get the number of forward passes and of images embedded through the batcher."""
+        return {"batches": self.batches, "images": self.images}
@@ -1,3 +1,4 @@
+from dataclasses import asdict
 from pathlib import Path
 import os
 import requests
@@ -15,7 +16,8 @@ from sentence_transformers import SentenceTransformer
 from typing import Union, List, Tuple
 import faiss
 import numpy as np
-from data.productos_del_json_copy import PRODUCTS_JSON
+from data import productos_del_json_copy as catalog
+from .image_batch_service import ImageEmbeddingBatcher
 
 
 
@@ -36,6 +38,13 @@ class ImageService:
 
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
         self.model.to(self.device)
+        # En GPU, CLIP en float16: la mitad de bytes por tensor y uso de tensor cores
+        if self.device == "cuda":
+            self.model.half()
+        self.model.eval()
+
+        # Las consultas concurrentes por imagen comparten una pasada de CLIP
+        self.image_batcher = ImageEmbeddingBatcher(self.encode_images)
 
         # Cargar Florence2 para descripciones
         self.florence_model = AutoModelForCausalLM.from_pretrained("microsoft/Florence-2-base", trust_remote_code=True)
@@ -48,8 +57,11 @@ class ImageService:
         self.traduccion_model = MarianMTModel.from_pretrained(self.model_name_traduccion)
 
 
-    def encoder_list(self, texts: List[str]):
-        embeddings = self.model_encoder.encode(texts)
+    def encoder_list(self, texts: List[str], batch_size: int = 64):
+        # encode ordena por longitud internamente: cada lote se rellena lo mínimo
+        embeddings = self.model_encoder.encode(
+            texts, batch_size=batch_size, convert_to_numpy=True, show_progress_bar=False
+        )
         return np.array(embeddings)
 
     def encoder(self, text):
@@ -65,12 +77,8 @@ class ImageService:
                 response.raise_for_status()
                 image = Image.open(io.BytesIO(response.content)).convert("RGB")
             else:
-                image = Image.open(image_path).convert("RGB")
-            inputs = self.processor(images=image, return_tensors="pt").to(self.device)
-            with torch.no_grad():
-                image_embedding = self.model.get_image_features(**inputs)
-            image_embedding = image_embedding.cpu().numpy()
-            embeddings.append(image_embedding) 
+                image = catalog.get_image(image_path)
+            embeddings.append(self.encode_images([image]))
         return np.vstack(embeddings)
 
     def _compute_image_embedding(self, image: Union[str, Image.Image]) -> np.ndarray:
@@ -80,20 +88,25 @@ class ImageService:
                 response.raise_for_status()
                 img = Image.open(io.BytesIO(response.content)).convert("RGB")
             else:
-                img = Image.open(image).convert("RGB")
+                img = catalog.get_image(image)
         elif isinstance(image, Image.Image):
             img = image.convert("RGB")
         else:
             raise TypeError("image debe ser una ruta (str) o PIL.Image.Image")
 
-        inputs = self.processor(images=img, return_tensors="pt").to(self.device)
-        with torch.no_grad():
-            emb = self.model.get_image_features(**inputs)
-        emb = emb.cpu().numpy().astype("float32")
-        return emb
+        return self.image_batcher.encode(img)
 
-    def get_list_embeddings(self, images: List[Union[str, Image.Image]]):
-        embeddings = []
+    def encode_images(self, imgs: List[Image.Image]) -> np.ndarray:
+        """Embed a list of RGB images with one CLIP forward pass, as a (n, d) float32 array."""
+        inputs = self.processor(images=imgs, return_tensors="pt")
+        # Mismo dtype que el modelo (float16 en GPU)
+        pixel_values = inputs["pixel_values"].to(self.device, dtype=self.model.dtype)
+        with torch.inference_mode():
+            emb = self.model.get_image_features(pixel_values=pixel_values)
+        return emb.float().cpu().numpy()
+
+    def get_list_embeddings(self, images: List[Union[str, Image.Image]], batch_size: int = 32):
+        imgs = []
         for image in tqdm(images, desc="Procesando imágenes"):
             if isinstance(image, str):
                 if image.startswith(('http://', 'https://')):
@@ -101,14 +114,17 @@ class ImageService:
                     response.raise_for_status()
                     img = Image.open(io.BytesIO(response.content)).convert("RGB")
                 else:
-                    img = Image.open(image).convert("RGB")
+                    img = catalog.get_image(image)
             elif isinstance(image, Image.Image):
                 img = image.convert("RGB")
             else:
                 raise TypeError("Debe ser una ruta (str) o PIL.Image.Image")
+            imgs.append(img)
 
-            emb = self._compute_image_embedding(img)
-            embeddings.append(emb)
+        # Una pasada de CLIP por lote en lugar de una por imagen
+        embeddings = [
+            self.encode_images(imgs[start:start + batch_size]) for start in range(0, len(imgs), batch_size)
+        ]
 
         return np.vstack(embeddings)
 
@@ -121,7 +137,7 @@ class ImageService:
                     response.raise_for_status()
                     img = Image.open(io.BytesIO(response.content)).convert("RGB")
                 else:
-                    img = Image.open(image).convert("RGB")
+                    img = catalog.get_image(image)
             else:
                 img = image.convert("RGB")
             
@@ -179,8 +195,7 @@ class ImageService:
 
     def get_product(self, product_id: str) -> Optional[dict]:
         """Return a copy of the product dict matching product_id, or None if not found."""
-        id = int(product_id)
-        for producto in PRODUCTS_JSON:
-            if producto.get("id") == id:
-                return producto.copy()
-        return None
\ No newline at end of file
+        record = catalog.product_by_id_str(product_id)
+        if record is None:
+            return None
+        return {**asdict(record), "id": str(record.id)}
\ No newline at end of file
@@ -1,4 +1,7 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator, Tuple
+from collections import deque
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from ..models.product import Product, ProductCreate, ProductUpdate
 from ..repositories.vector_repository import VectorRepository
 from ..repositories.bm25_repository import BM25Repository
@@ -8,6 +11,7 @@ from ..services.search_service import SearchService
 from ..services.rrf_service import RRFService
 from ..services.image_service import ImageService
 from ..services.multi_stage_service import MultiStageService
+from ..services.semantic_cache_service import SemanticQueryCache
 from ..models.search_config import SearchStrategy
 from ..config.settings import settings
 import logging
@@ -32,6 +36,9 @@ class ProductService:
         self.rrf_service = RRFService()
         self.search_service = SearchService(self.vector_repo, self.bm25_repo, self.image_repo, self.caption_repo, self.image_service, self.rrf_service)
         self.multi_stage_service = MultiStageService(self.rrf_service)
+        self.query_cache = SemanticQueryCache() if settings.SEMANTIC_CACHE_ENABLED else None
+        # Repeated query strings reuse their embedding instead of calling the API again
+        self._embed_query = lru_cache(maxsize=settings.QUERY_EMBEDDING_CACHE_SIZE)(self._generate_query_embedding)
         
         # Try to load existing indexes
         try:
@@ -122,6 +129,8 @@ class ProductService:
         self.caption_repo.save_index()
         self.image_repo.save_index()
         
+        self._invalidate_query_cache()
+        
         logger.info(f"Successfully created product: {product.id}")
         return product
     
@@ -175,6 +184,8 @@ class ProductService:
         self.caption_repo.save_index()
         self.image_repo.save_index()
         
+        self._invalidate_query_cache()
+        
         logger.info(f"Successfully updated product: {id}")
         return updated_product
     
@@ -204,6 +215,8 @@ class ProductService:
         self.caption_repo.save_index()
         self.image_repo.save_index()
         
+        self._invalidate_query_cache()
+        
         logger.info(f"Successfully deleted product: {id}")
         return True
     
@@ -243,21 +256,118 @@ class ProductService:
         
         logger.info(f"Searching products: query='{query}', type={search_type}, top_k={top_k}")
         
+        if search_type == "keyword":
+            return self.search_service.keyword_search(query=query, top_k=top_k)
+        
+        # Embedding-based searches: embed once, reuse for the semantic cache and the search
+        query_embedding = list(self._embed_query(query.strip()))
+        cache_namespace = (search_type, top_k, bm25_weight, vector_weight)
+        use_cache = self.query_cache is not None and search_type in settings.SEMANTIC_CACHE_SEARCH_TYPES
+        if use_cache:
+            cached_results = self.query_cache.get(query_embedding, namespace=cache_namespace)
+            if cached_results is not None:
+                logger.info(f"Semantic cache hit for query='{query}'")
+                return cached_results
+        
         if search_type == "hybrid":
-            return self.search_service.hybrid_search(
+            results = self.search_service.hybrid_search(
                 query=query,
                 bm25_weight=bm25_weight,
                 vector_weight=vector_weight,
-                top_k=top_k
+                top_k=top_k,
+                query_embedding=query_embedding
             )
         elif search_type == "semantic":
-            return self.search_service.semantic_search(query=query, top_k=top_k)
-        elif search_type == "keyword":
-            return self.search_service.keyword_search(query=query, top_k=top_k)
+            results = self.search_service.semantic_search(query=query, top_k=top_k, query_embedding=query_embedding)
         elif search_type == "rrf":
             # Extract rrf_k from vector_weight parameter for backward compatibility
             rrf_k = int(bm25_weight) if bm25_weight and bm25_weight > 1 else 60
-            return self.search_service.rrf_search(query=query, k=rrf_k, top_k=top_k)
+            results = self.search_service.rrf_search(query=query, k=rrf_k, top_k=top_k, query_embedding=query_embedding)
+        
+        if use_cache:
+            self.query_cache.put(query_embedding, results, namespace=cache_namespace)
+        
+        return results
+    
+    def _generate_query_embedding(self, query: str) -> Tuple[float, ...]:
+        """Embed a query string (wrapped by the per-instance LRU in __init__)."""
+        return tuple(self.vector_repo.embedding_service.generate_embedding(query))
+    
+    def batch_search_products(
+        self,
+        queries: List[str],
+        search_type: str = "hybrid",
+        bm25_weight: float = None,
+        vector_weight: float = None,
+        top_k: int = None
+    ) -> List[List[str]]:
+        """
+        Search several queries in one pass.
+        
+        Args:
+            queries: Search queries
+            search_type: Type of search ('hybrid', 'semantic', 'keyword', 'rrf')
+            bm25_weight: Weight for BM25 results (hybrid only)
+            vector_weight: Weight for vector results (hybrid only)
+            top_k: Number of results to return per query
+            
+        Returns:
+            One list of product IDs per query, in input order
+            
+        Raises:
+            ValueError: If the queries list or any query is empty, or search_type is invalid
+        """
+        if not queries:
+            raise ValueError("Queries list cannot be empty")
+        if any(not query or not query.strip() for query in queries):
+            raise ValueError("Query cannot be empty")
+        
+        valid_search_types = ["hybrid", "semantic", "keyword", "rrf"]
+        if search_type not in valid_search_types:
+            raise ValueError(f"Invalid search_type. Must be one of: {valid_search_types}")
+        
+        if top_k is None:
+            top_k = settings.DEFAULT_TOP_K
+        
+        # Same rrf_k convention as search_products
+        rrf_k = int(bm25_weight) if search_type == "rrf" and bm25_weight and bm25_weight > 1 else 60
+        
+        return self.search_service.batch_search(
+            queries,
+            search_type=search_type,
+            bm25_weight=bm25_weight,
+            vector_weight=vector_weight,
+            top_k=top_k,
+            rrf_k=rrf_k
+        )
+    
+    def search_all_methods(self, query: str, top_k: int = None) -> Dict[str, List[str]]:
+        """
+        Rank a query with the hybrid, semantic and keyword methods at once.
+        
+        The query is embedded once and each index is searched once, instead of
+        one full search per method.
+        
+        Args:
+            query: Search query
+            top_k: Number of results per method
+            
+        Returns:
+            Dictionary with 'hybrid', 'semantic' and 'keyword' lists of product IDs
+            
+        Raises:
+            ValueError: If query is empty
+        """
+        if not query or not query.strip():
+            raise ValueError("Query cannot be empty")
+        
+        if top_k is None:
+            top_k = settings.DEFAULT_TOP_K
+        
+        logger.info(f"Searching products with all methods: query='{query}', top_k={top_k}")
+        
+        query_embedding = list(self._embed_query(query.strip()))
+        return self.search_service.search_all_methods(query, top_k=top_k, query_embedding=query_embedding)
     
     def get_product_by_id(self, id: str) -> Optional[Product]:
         """
@@ -271,6 +381,18 @@ class ProductService:
         """
         return self.vector_repo.get_product_by_id(id)
     
+    def get_products_by_ids(self, ids: List[str]) -> List[Optional[Product]]:
+        """
+        Get several products by their IDs in a single lookup.
+        
+        Args:
+            ids: Product identifiers, e.g. the ranked IDs returned by a search
+            
+        Returns:
+            List aligned with ids, holding None for IDs that are not found
+        """
+        return self.vector_repo.get_products_by_ids(ids)
+    
     def list_all_products(self) -> List[Product]:
         """
         Get all products in the system.
@@ -308,6 +430,12 @@ class ProductService:
             "image_index_size": self.image_repo.get_product_count(),
             "caption_index_size": self.caption_repo.get_product_count()
         })
+        if self.query_cache is not None:
+            stats["semantic_cache"] = self.query_cache.get_statistics()
+        stats["query_embedding_cache"] = self._embed_query.cache_info()._asdict()
+        embedding_cache = self.vector_repo.embedding_service.cache
+        if embedding_cache is not None:
+            stats["embedding_cache"] = embedding_cache.get_statistics()
         return stats
     
     def rebuild_indexes(self) -> None:
@@ -336,6 +464,8 @@ class ProductService:
         self.caption_repo.save_index()
         self.image_repo.save_index()
         
+        self._invalidate_query_cache()
+        
         logger.info(f"Successfully rebuilt indexes for {len(products)} products")
     
     def clear_all_data(self) -> None:
@@ -372,43 +502,143 @@ class ProductService:
         self.caption_repo.save_index()
         self.image_repo.save_index()
         
+        self._invalidate_query_cache()
+        
         logger.info("Successfully cleared all product data")
     
-    def batch_create_products(self, products_data: List[Dict[str, str]]) -> List[Product]:
+    def batch_create_products(
+        self,
+        products_data: List[Dict[str, str]],
+        embeddings: Optional[List[List[float]]] = None
+    ) -> List[Product]:
         """
         Create multiple products in batch for better performance.
         
+        Products whose ID already exists are updated in place (upsert). Only new
+        products and products whose text changed are embedded, so appending a
+        batch to an existing catalog does not re-embed it.
+        
         Args:
             products_data: List of dictionaries with 'id', 'title', 'description'
+            embeddings: Precomputed embeddings of each product's combined text,
+                aligned with products_data (skips the embeddings API when given)
             
         Returns:
-            List of created Product objects
+            List of created or updated Product objects
             
         Raises:
-            ValueError: If any product data is invalid
+            ValueError: If any product data is invalid or embeddings are misaligned
         """
         logger.info(f"Creating {len(products_data)} products in batch")
         
+        if embeddings is not None and len(embeddings) != len(products_data):
+            raise ValueError("Embeddings count does not match products count")
+        
+        # Validate all products first (the last entry wins for repeated IDs)
+        products_by_id: Dict[str, Product] = {}
+        embeddings_by_id: Dict[str, List[float]] = {}
+        for i, data in enumerate(products_data):
+            product_data = ProductCreate(**data)
+            existing = self.get_product_by_id(product_data.id)
+            products_by_id[product_data.id] = Product(
+                id=product_data.id,
+                title=product_data.title,
+                description=product_data.description,
+                image_url=existing.image_url if existing else None
+            )
+            if embeddings is not None:
+                embeddings_by_id[product_data.id] = embeddings[i]
+        products = list(products_by_id.values())
+        
+        # Add/update both indexes, embedding only new or changed products
+        embedded = self.vector_repo.upsert_products(
+            products,
+            embeddings=[embeddings_by_id[product.id] for product in products] if embeddings is not None else None
+        )
+        self.bm25_repo.upsert_products(products)
+        
+        # Save vector index
+        self.vector_repo.save_index()
+        
+        self._invalidate_query_cache()
+        
+        logger.info(f"Successfully created {len(products)} products in batch ({embedded} embedded)")
+        return products
+    
+    def stream_create_products(
+        self,
+        products_data: List[Dict[str, str]],
+        batch_size: int = None,
+        max_pending_batches: int = 2
+    ) -> Iterator[List[Product]]:
+        """
+        Create products batch by batch, overlapping embedding calls with index writes.
+        
+        Embedding requests for the next batches run in background threads while the
+        current batch is written into the vector and BM25 indexes. At most
+        ``max_pending_batches`` batches are embedded ahead of the writer.
+        
+        Args:
+            products_data: List of dictionaries with 'id', 'title', 'description'
+            batch_size: Products per batch (defaults to settings.BATCH_SIZE)
+            max_pending_batches: Maximum batches embedded ahead of the index writer
+            
+        Yields:
+            List of Product objects created by each batch, in input order
+            
+        Raises:
+            ValueError: If any product data is invalid or already exists
+        """
+        if batch_size is None:
+            batch_size = settings.BATCH_SIZE
+        
         # Validate all products first
         products = []
         for data in products_data:
             product_data = ProductCreate(**data)
-            product = Product(
+            if self.get_product_by_id(product_data.id):
+                raise ValueError(f"Product with ID {product_data.id} already exists")
+            products.append(Product(
                 id=product_data.id,
                 title=product_data.title,
                 description=product_data.description
-            )
-            products.append(product)
+            ))
         
-        # Create indexes with all products
-        self.vector_repo.create_index(products)
-        self.bm25_repo.create_index(products)
+        batches = [products[i:i + batch_size] for i in range(0, len(products), batch_size)]
+        logger.info(f"Streaming {len(products)} products in {len(batches)} batches")
         
-        # Save vector index
-        self.vector_repo.save_index()
+        embedding_service = self.vector_repo.embedding_service
         
-        logger.info(f"Successfully created {len(products)} products in batch")
-        return products
+        def embed(batch: List[Product]) -> List[List[float]]:
+            return embedding_service.generate_embeddings_batch(
+                [product.get_combined_text() for product in batch]
+            )
+        
+        written = 0
+        try:
+            with ThreadPoolExecutor(max_workers=max_pending_batches) as executor:
+                pending = deque()
+                next_batch = 0
+                while next_batch < len(batches) or pending:
+                    # Keep the embedding stage ahead of the writer
+                    while next_batch < len(batches) and len(pending) < max_pending_batches:
+                        batch = batches[next_batch]
+                        pending.append((batch, executor.submit(embed, batch)))
+                        next_batch += 1
+                    
+                    batch, future = pending.popleft()
+                    embeddings = future.result()
+                    
+                    self.vector_repo.create_index(batch, embeddings=embeddings)
+                    self.bm25_repo.add_products(batch)
+                    written += len(batch)
+                    
+                    yield batch
+        finally:
+            if written:
+                self.vector_repo.save_index()
+                self._invalidate_query_cache()
+                logger.info(f"Successfully streamed {written} products into the indexes")
     
     def search_with_strategy(
         self,
@@ -435,11 +665,16 @@ class ProductService:
         if top_k is None:
             top_k = settings.DEFAULT_TOP_K
         
-        # Prepare search methods for multi-stage service
+        # Prepare search methods for multi-stage service; vector stages share the
+        # LRU-cached query embedding instead of embedding the query once per stage
         search_methods = {
             "bm25_search": lambda q, top_k: self.search_service.keyword_search(q, top_k),
-            "vector_search": lambda q, top_k: self.search_service.semantic_search(q, top_k),
-            "hybrid_search": lambda q, top_k, **kwargs: self.search_service.hybrid_search(q, top_k=top_k, **kwargs)
+            "vector_search": lambda q, top_k: self.search_service.semantic_search(
+                q, top_k, query_embedding=list(self._embed_query(q.strip()))
+            ),
+            "hybrid_search": lambda q, top_k, **kwargs: self.search_service.hybrid_search(
+                q, top_k=top_k, query_embedding=list(self._embed_query(q.strip())), **kwargs
+            )
         }
         
         # Execute strategy
@@ -456,6 +691,11 @@ class ProductService:
         
         return result
     
+    def _invalidate_query_cache(self) -> None:
+        """Drop cached search results after the indexed products change."""
+        if self.query_cache is not None:
+            self.query_cache.clear()
+    
     def get_available_strategies(self) -> List[Dict[str, Any]]:
         """
         Get list of available search strategies.
@@ -6,6 +6,9 @@ RRF is the industry standard for hybrid search result fusion.
 """
 
 from typing import List, Tuple, Dict, Any
+import heapq
+import operator
+import numpy as np
 import logging
 
 logger = logging.getLogger(__name__)
@@ -23,6 +26,63 @@ class RRFService:
         """
         self.default_k = default_k
     
+    def _accumulate_scores(
+        self,
+        ranked_lists: List[List[Tuple[str, float]]],
+        k: int
+    ) -> Tuple[List[str], np.ndarray]:
+        """
+        Accumulate RRF scores over integer document indices.
+        
+        Args:
+            ranked_lists: List of ranked result lists, each containing (doc_id, score) tuples
+            k: RRF parameter
+            
+        Returns:
+            Tuple of (doc_ids in first-seen order, float64 RRF score per doc_id)
+        """
+        doc_index: Dict[str, int] = {}
+        positions = []
+        contributions = []
+        
+        for list_idx, ranked_list in enumerate(ranked_lists):
+            logger.debug(f"Processing ranked list {list_idx + 1} with {len(ranked_list)} items")
+            
+            positions.append(np.fromiter(
+                (doc_index.setdefault(doc_id, len(doc_index)) for doc_id, _ in ranked_list),
+                dtype=np.int32,
+                count=len(ranked_list)
+            ))
+            # RRF contribution of rank r (1-based): 1 / (k + r)
+            contributions.append(1.0 / (k + np.arange(1, len(ranked_list) + 1, dtype=np.float64)))
+        
+        totals = np.zeros(len(doc_index), dtype=np.float64)
+        if doc_index:
+            np.add.at(totals, np.concatenate(positions), np.concatenate(contributions))
+        
+        return list(doc_index), totals
+    
+    def _top_indices(self, totals: np.ndarray, top_k: int) -> np.ndarray:
+        """
+        Indices of the top_k scores, descending, ties kept in first-seen order.
+        
+        Args:
+            totals: RRF score per document index
+            top_k: Number of indices to return
+            
+        Returns:
+            Array of document indices
+        """
+        if 0 < top_k < len(totals):
+            # Partition to the top_k-th score, keeping every document tied with it
+            threshold = np.partition(totals, len(totals) - top_k)[len(totals) - top_k]
+            candidates = np.flatnonzero(totals >= threshold)
+        else:
+            candidates = np.arange(len(totals))
+        
+        order = np.argsort(-totals[candidates], kind="stable")
+        return candidates[order[:top_k]]
+    
     def reciprocal_rank_fusion(
         self, 
         ranked_lists: List[List[Tuple[str, float]]], 
@@ -47,24 +107,12 @@ class RRFService:
         if not ranked_lists:
             return []
         
-        # Dictionary to accumulate RRF scores for each document
-        rrf_scores: Dict[str, float] = {}
+        # Accumulate RRF scores for each document
+        doc_ids, totals = self._accumulate_scores(ranked_lists, k)
         
-        # Process each ranked list
-        for list_idx, ranked_list in enumerate(ranked_lists):
-            logger.debug(f"Processing ranked list {list_idx + 1} with {len(ranked_list)} items")
-            
-            for rank, (doc_id, original_score) in enumerate(ranked_list, start=1):
-                # Calculate RRF contribution: 1 / (k + rank)
-                rrf_contribution = 1.0 / (k + rank)
-                
-                # Accumulate RRF score
-                if doc_id not in rrf_scores:
-                    rrf_scores[doc_id] = 0.0
-                rrf_scores[doc_id] += rrf_contribution
-        
-        # Sort by RRF score (descending) and return
-        result = sorted(rrf_scores.items(), key=lambda x: x[1], reverse=True)
+        # Sort by RRF score (descending, stable on ties) and return
+        order = np.argsort(-totals, kind="stable")
+        result = list(zip([doc_ids[i] for i in order], totals[order].tolist()))
         
         logger.info(f"RRF fusion complete: combined {len(ranked_lists)} lists into {len(result)} unique results")
         return result
@@ -91,15 +139,15 @@ class RRFService:
         if k is None:
             k = self.default_k
         
-        # Convert to ranked lists format (doc_id, dummy_score)
-        bm25_ranked = [(doc_id, 1.0) for doc_id in bm25_results]
-        vector_ranked = [(doc_id, 1.0) for doc_id in vector_results]
-        
-        # Apply RRF
-        rrf_results = self.reciprocal_rank_fusion([bm25_ranked, vector_ranked], k=k)
+        # Two short candidate lists: a score dict is cheaper than the array path
+        rrf_scores: Dict[str, float] = {}
+        for ranked_ids in (bm25_results, vector_results):
+            for rank, doc_id in enumerate(ranked_ids, start=1):
+                rrf_scores[doc_id] = rrf_scores.get(doc_id, 0.0) + 1.0 / (k + rank)
         
-        # Return top_k document IDs
-        return [doc_id for doc_id, score in rrf_results[:top_k]]
+        # Return top_k document IDs (nlargest keeps first-seen order on ties, like a stable sort)
+        top = heapq.nlargest(top_k, rrf_scores.items(), key=operator.itemgetter(1))
+        return [doc_id for doc_id, score in top]
     
     def combine_multiple_searches(
         self,
@@ -128,11 +176,12 @@ class RRFService:
             ranked_lists.append(ranked_list)
             logger.debug(f"Added {len(ranked_list)} results from {method_name}")
         
-        # Apply RRF
-        rrf_results = self.reciprocal_rank_fusion(ranked_lists, k=k)
+        # Apply RRF, selecting the top_k results without sorting the whole pool
+        doc_ids, totals = self._accumulate_scores(ranked_lists, k)
+        top = self._top_indices(totals, top_k)
         
-        # Return top_k results
-        return rrf_results[:top_k]
+        logger.info(f"RRF fusion complete: combined {len(ranked_lists)} lists into {len(doc_ids)} unique results")
+        return list(zip([doc_ids[i] for i in top], totals[top].tolist()))
     
     def get_rrf_weights(
         self,
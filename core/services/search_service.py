@@ -53,7 +53,8 @@ class SearchService:
         query: str,
         bm25_weight: float = None,
         vector_weight: float = None,
-        top_k: int = None
+        top_k: int = None,
+        query_embedding: Optional[List[float]] = None
     ) -> List[str]:
         """
         Perform hybrid search combining BM25 and vector search.
@@ -63,6 +64,7 @@ class SearchService:
             bm25_weight: Weight for BM25 results (defaults to settings)
             vector_weight: Weight for vector results (defaults to settings)
             top_k: Number of results to return (defaults to settings)
+            query_embedding: Precomputed query embedding (optional)
             
         Returns:
             List of product IDs ranked by combined score
@@ -100,15 +102,15 @@ class SearchService:
         search_k = min(top_k * 2, 50)  # Get more results for better ranking
         
         bm25_results = self.bm25_repo.search_keywords(query, k=search_k)
-        vector_results = self.vector_repo.search_similar(query, k=search_k)
+        vector_results = self.vector_repo.search_similar(query, k=search_k, query_embedding=query_embedding)
         
         # Combine scores
         combined_results = self.combine_scores(
-            bm25_results, vector_results, [bm25_weight, vector_weight]
+            bm25_results, vector_results, [bm25_weight, vector_weight], top_k=top_k
         )
         
         # Return top-k results
-        return [product_id for product_id, _ in combined_results[:top_k]]
+        return [product_id for product_id, _ in combined_results]
     
     def keyword_search(self, query: str, top_k: int = None) -> List[str]:
         """
@@ -135,13 +137,14 @@ class SearchService:
         results = self.bm25_repo.search_keywords(query, k=top_k)
         return [product_id for product_id, _ in results]
     
-    def semantic_search(self, query: str, top_k: int = None) -> List[str]:
+    def semantic_search(self, query: str, top_k: int = None, query_embedding: Optional[List[float]] = None) -> List[str]:
         """
         Perform semantic-only search using vector similarity.
         
         Args:
             query: Search query
             top_k: Number of results to return (defaults to settings)
+            query_embedding: Precomputed query embedding (optional)
             
         Returns:
             List of product IDs ranked by semantic similarity
@@ -157,14 +160,68 @@ class SearchService:
         
         logger.info(f"Performing semantic search for query: '{query}'")
         
-        results = self.vector_repo.search_similar(query, k=top_k)
+        results = self.vector_repo.search_similar(query, k=top_k, query_embedding=query_embedding)
         return [product_id for product_id, _ in results]
     
+    def search_all_methods(
+        self,
+        query: str,
+        top_k: int = None,
+        query_embedding: Optional[List[float]] = None
+    ) -> Dict[str, List[str]]:
+        """
+        Rank a query with the hybrid, semantic and keyword methods at once.
+        
+        BM25 and the vector index are searched a single time each and the
+        hybrid ranking is combined from those same candidates, using the
+        default weights.
+        
+        Args:
+            query: Search query
+            top_k: Number of results per method (defaults to settings)
+            query_embedding: Precomputed query embedding (optional)
+            
+        Returns:
+            Dictionary with 'hybrid', 'semantic' and 'keyword' lists of product IDs
+            
+        Raises:
+            ValueError: If query is empty
+        """
+        if not query or not query.strip():
+            raise ValueError("Query cannot be empty")
+        
+        if top_k is None:
+            top_k = settings.DEFAULT_TOP_K
+        
+        logger.info(f"Performing search with all methods for query: '{query}'")
+        
+        # Same candidate depth as hybrid_search, deep enough for the single-method rankings too
+        search_k = min(top_k * 2, 50)
+        k = max(search_k, top_k)
+        
+        bm25_results = self.bm25_repo.search_keywords(query, k=k)
+        vector_results = self.vector_repo.search_similar(query, k=k, query_embedding=query_embedding)
+        
+        total_weight = settings.DEFAULT_BM25_WEIGHT + settings.DEFAULT_VECTOR_WEIGHT
+        combined_results = self.combine_scores(
+            bm25_results[:search_k],
+            vector_results[:search_k],
+            [settings.DEFAULT_BM25_WEIGHT / total_weight, settings.DEFAULT_VECTOR_WEIGHT / total_weight],
+            top_k=top_k
+        )
+        
+        return {
+            "hybrid": [product_id for product_id, _ in combined_results],
+            "semantic": [product_id for product_id, _ in vector_results[:top_k]],
+            "keyword": [product_id for product_id, _ in bm25_results[:top_k]]
+        }
+    
     def combine_scores(
         self,
         bm25_results: List[Tuple[str, float]],
         vector_results: List[Tuple[str, float]],
-        weights: List[float]
+        weights: List[float],
+        top_k: Optional[int] = None
     ) -> List[Tuple[str, float]]:
         """
         Combine scores from BM25 and vector search results.
@@ -173,6 +230,7 @@ class SearchService:
             bm25_results: List of (product_id, score) from BM25 search
             vector_results: List of (product_id, score) from vector search
             weights: [bm25_weight, vector_weight] normalized weights
+            top_k: Only return the best top_k results (all results if None)
             
         Returns:
             List of (product_id, combined_score) sorted by score descending
@@ -195,9 +253,40 @@ class SearchService:
             combined_scores[product_id] = combined_scores.get(product_id, 0) + (score * vector_weight)
         
         # Sort by combined score (descending)
-        sorted_results = sorted(combined_scores.items(), key=lambda x: x[1], reverse=True)
+        if top_k is None or top_k >= len(combined_scores):
+            return sorted(combined_scores.items(), key=lambda x: x[1], reverse=True)
+        
+        return self._select_top_k(combined_scores, top_k)
+    
+    @staticmethod
+    def _select_top_k(scores_by_id: Dict[str, float], top_k: int) -> List[Tuple[str, float]]:
+        """
+        Select the top_k highest scores in O(n) with np.argpartition.
+        
+        Ties are resolved in insertion order, exactly like a stable descending sort.
         
-        return sorted_results
+        Args:
+            scores_by_id: Dictionary of product_id -> score
+            top_k: Number of results to keep (must be smaller than the dictionary)
+            
+        Returns:
+            List of (product_id, score) sorted by score descending
+        """
+        if top_k <= 0:
+            return []
+        
+        product_ids = list(scores_by_id)
+        scores = np.fromiter(scores_by_id.values(), dtype=np.float64, count=len(product_ids))
+        
+        # Value of the k-th best score; keep everything above it plus the earliest ties
+        kth = len(scores) - top_k
+        threshold = np.partition(scores, kth)[kth]
+        above = np.flatnonzero(scores > threshold)
+        ties = np.flatnonzero(scores == threshold)[:top_k - len(above)]
+        candidates = np.sort(np.concatenate([above, ties]))
+        
+        order = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [(product_ids[i], float(scores[i])) for i in order]
     
     def _normalize_scores(self, results: List[Tuple[str, float]]) -> Dict[str, float]:
         """
@@ -232,7 +321,8 @@ class SearchService:
         self,
         query: str,
         k: int = None,
-        top_k: int = None
+        top_k: int = None,
+        query_embedding: Optional[List[float]] = None
     ) -> List[str]:
         """
         Perform search using Reciprocal Rank Fusion (RRF).
@@ -241,6 +331,7 @@ class SearchService:
             query: Search query
             k: RRF parameter (higher values reduce impact of rank differences)
             top_k: Number of results to return
+            query_embedding: Precomputed query embedding (optional)
             
         Returns:
             List of product IDs ranked by RRF score
@@ -264,7 +355,7 @@ class SearchService:
         logger.debug(f"BM25 search returned {len(bm25_results)} results")
         
         # Get vector results
-        vector_results = self.semantic_search(query, top_k=retrieval_limit)
+        vector_results = self.semantic_search(query, top_k=retrieval_limit, query_embedding=query_embedding)
         logger.debug(f"Vector search returned {len(vector_results)} results")
         
         # Apply RRF fusion with optimized parameters
@@ -278,9 +369,86 @@ class SearchService:
         logger.info(f"RRF search completed: {len(final_results)} final results")
         return final_results
 
+    def batch_search(
+        self,
+        queries: List[str],
+        search_type: str = "hybrid",
+        bm25_weight: float = None,
+        vector_weight: float = None,
+        top_k: int = None,
+        rrf_k: int = 60
+    ) -> List[List[str]]:
+        """
+        Run the same kind of search for several queries at once.
+        
+        BM25 scores every query in one sparse matrix product and the vector side
+        embeds all queries in one API request and searches FAISS once.
+        
+        Args:
+            queries: Search queries
+            search_type: Type of search ('hybrid', 'semantic', 'keyword', 'rrf')
+            bm25_weight: Weight for BM25 results (hybrid only)
+            vector_weight: Weight for vector results (hybrid only)
+            top_k: Number of results to return per query
+            rrf_k: RRF parameter (rrf only)
+            
+        Returns:
+            One list of product IDs per query, in input order
+        """
+        if top_k is None:
+            top_k = settings.DEFAULT_TOP_K
+        
+        logger.info(f"Performing batch {search_type} search for {len(queries)} queries")
+        
+        if search_type == "keyword":
+            return [
+                [product_id for product_id, _ in results]
+                for results in self.bm25_repo.search_keywords_batch(queries, k=top_k)
+            ]
+        
+        if search_type == "semantic":
+            return [
+                [product_id for product_id, _ in results]
+                for results in self.vector_repo.search_similar_batch(queries, k=top_k)
+            ]
+        
+        if search_type == "rrf":
+            retrieval_limit = max(top_k * 5, 100)
+            bm25_batch = self.bm25_repo.search_keywords_batch(queries, k=retrieval_limit)
+            vector_batch = self.vector_repo.search_similar_batch(queries, k=retrieval_limit)
+            return [
+                self.rrf_service.combine_search_results(
+                    bm25_results=[product_id for product_id, _ in bm25_results],
+                    vector_results=[product_id for product_id, _ in vector_results],
+                    k=rrf_k,
+                    top_k=top_k
+                )
+                for bm25_results, vector_results in zip(bm25_batch, vector_batch)
+            ]
+        
+        # Hybrid: same weight handling as hybrid_search
+        if bm25_weight is None:
+            bm25_weight = settings.DEFAULT_BM25_WEIGHT
+        if vector_weight is None:
+            vector_weight = settings.DEFAULT_VECTOR_WEIGHT
+        if bm25_weight < 0 or vector_weight < 0:
+            raise ValueError("Weights must be non-negative")
+        total_weight = bm25_weight + vector_weight
+        if total_weight == 0:
+            raise ValueError("At least one weight must be positive")
+        weights = [bm25_weight / total_weight, vector_weight / total_weight]
+        
+        search_k = min(top_k * 2, 50)
+        bm25_batch = self.bm25_repo.search_keywords_batch(queries, k=search_k)
+        vector_batch = self.vector_repo.search_similar_batch(queries, k=search_k)
+        return [
+            [product_id for product_id, _ in self.combine_scores(bm25_results, vector_results, weights, top_k=top_k)]
+            for bm25_results, vector_results in zip(bm25_batch, vector_batch)
+        ]
+
 #----------------------------------------------------------------------------------------------------------------------------
 
-    def search_by_image_A(self, query_image: Union[str, Image.Image], k = 10):
+    def search_by_image_A(self, query_image: Union[str, Image.Image], k = 10, query_embedding: Optional[np.ndarray] = None):
 
         if not query_image:
             raise ValueError("Query cannot be empty")
@@ -290,8 +458,8 @@ class SearchService:
 
         logger.info(f"Performing image search for query image with k={k}")
 
-        # Calcular embedding de la consulta
-        q_emb = self.image_service._compute_image_embedding(query_image)
+        # Calcular embedding de la consulta (salvo que ya venga calculado)
+        q_emb = query_embedding if query_embedding is not None else self.image_service._compute_image_embedding(query_image)
         logger.info(f"Embedding shape: {q_emb.shape}")
         logger.info(f"Embedding type: {type(q_emb)}")
         logger.info(f"Embedding dtype: {q_emb.dtype}") 
@@ -381,7 +549,7 @@ class SearchService:
         results = self.vector_repo.search_similar(caption, k=k)
         return results
 
-    def hydrid_search_image_A(self, query_image: Union[str, Image.Image], k: int = 10, peso_imagen: float = 0.4, peso_caption: float = 0.2, peso_description= 0.2, umbral: float = 0.0) -> List[Tuple[str, float]]:
+    def hydrid_search_image_A(self, query_image: Union[str, Image.Image], k: int = 10, peso_imagen: float = 0.4, peso_caption: float = 0.2, peso_description= 0.2, umbral: float = 0.0, query_embedding: Optional[np.ndarray] = None, caption: Optional[str] = None) -> List[Tuple[str, float]]:
 
         if not query_image:
             raise ValueError("Query cannot be empty")
@@ -398,10 +566,11 @@ class SearchService:
         if not (total == 1):
             raise ValueError("Los pesos deben sumar 1")
         
-        caption = self.image_service.generar_descripcion_imagen(query_image)
+        if caption is None:
+            caption = self.image_service.generar_descripcion_imagen(query_image)
 
         # Buscar en ambos índices
-        images = self.search_by_image_A(query_image, k*2)
+        images = self.search_by_image_A(query_image, k*2, query_embedding=query_embedding)
         captions = self.search_by_caption_A(caption, k*2)
         descriptions = self.search_by_description_A(caption, k*2)
 
@@ -442,7 +611,9 @@ class SearchService:
         peso_caption: float = 0.2,
         peso_description: float = 0.4,
         umbral: float = 0.0,
-        tol: float = 1e-6
+        tol: float = 1e-6,
+        query_embedding: Optional[np.ndarray] = None,
+        caption: Optional[str] = None
     ) -> List[Tuple[str, float, float, float, float]]:
 
         if not query_image:
@@ -459,8 +630,8 @@ class SearchService:
             raise ValueError(f"Los pesos deben sumar 1 (suma actual = {total})")
 
         # Ejecutar búsquedas (estas funciones deben devolver [(pid, sim), ...], sim en (0,1])
-        images = self.search_by_image_A(query_image, k * 2)     # [(pid, sim), ...]
-        captions = self.search_by_caption_A(query_image, k * 2) # [(pid, sim), ...]
+        images = self.search_by_image_A(query_image, k * 2, query_embedding=query_embedding)     # [(pid, sim), ...]
+        captions = self.search_by_caption_A(caption if caption is not None else query_image, k * 2) # [(pid, sim), ...]
         descriptions = self.vector_repo.search_similar(query, k * 2)    # [(pid, sim), ...]
 
         # Construir diccionarios (tomar la mejor similitud por pid)
@@ -0,0 +1,141 @@
+"""
+Semantic Query Cache
+
+Caches search results keyed by the meaning of the query instead of its exact text.
+Paraphrased queries ("wireless headphones" / "headphones wireless") reuse the
+ranked results of the first query when their embeddings are close enough.
+"""
+
+import threading
+import time
+from typing import List, Tuple, Dict, Optional, Hashable
+import numpy as np
+import faiss
+from ..config.settings import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticQueryCache:
+    """Near-duplicate query cache backed by a FAISS inner-product index."""
+
+    def __init__(
+        self,
+        dimension: int = None,
+        threshold: float = None,
+        ttl_seconds: float = None,
+        max_entries: int = None
+    ):
+        """
+        Initialize the semantic query cache.
+
+        Args:
+            dimension: Embedding dimension (defaults to settings)
+            threshold: Minimum cosine similarity to consider a cached query a hit
+            ttl_seconds: Time-to-live of cached entries in seconds (0 disables expiry)
+            max_entries: Maximum number of entries per namespace before it is reset
+        """
+        self.dimension = dimension or settings.VECTOR_DIMENSION
+        self.threshold = threshold if threshold is not None else settings.SEMANTIC_CACHE_THRESHOLD
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.SEMANTIC_CACHE_TTL
+        self.max_entries = max_entries or settings.SEMANTIC_CACHE_MAX_ENTRIES
+
+        # namespace -> (IndexFlatIP over normalized query vectors, [(timestamp, results)])
+        self._namespaces: Dict[Hashable, Tuple[faiss.Index, List[Tuple[float, List[str]]]]] = {}
+        # Searches run from several threadpool workers: index and records must change together
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _normalize(self, embedding: List[float]) -> np.ndarray:
+        """Convert an embedding to a L2-normalized float32 row vector."""
+        vector = np.array([embedding], dtype=np.float32)
+        faiss.normalize_L2(vector)
+        return vector
+
+    def _closest(self, entry, vector: np.ndarray) -> Tuple[float, int]:
+        """Similarity and record position of the closest cached query (-1 if none)."""
+        index, _ = entry
+        if index.ntotal == 0:
+            return -1.0, -1
+        scores, positions = index.search(vector, 1)
+        return float(scores[0][0]), int(positions[0][0])
+
+    def get(self, embedding: List[float], namespace: Hashable = None) -> Optional[List[str]]:
+        """
+        Look up cached results for a query embedding.
+
+        Args:
+            embedding: Query embedding
+            namespace: Search parameters the cached results depend on
+
+        Returns:
+            Cached list of product IDs if a similar query was found, None otherwise
+        """
+        vector = self._normalize(embedding)
+        with self._lock:
+            entry = self._namespaces.get(namespace)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            score, position = self._closest(entry, vector)
+            if position < 0 or score < self.threshold:
+                self.misses += 1
+                return None
+
+            # An expired record is a miss; put() overwrites it with the fresh results
+            timestamp, results = entry[1][position]
+            if self.ttl_seconds and time.time() - timestamp > self.ttl_seconds:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+        logger.debug(f"Semantic cache hit (similarity={score:.4f})")
+        return list(results)
+
+    def put(self, embedding: List[float], results: List[str], namespace: Hashable = None) -> None:
+        """
+        Store search results for a query embedding.
+
+        Args:
+            embedding: Query embedding
+            results: Ranked list of product IDs returned for the query
+            namespace: Search parameters the results depend on
+        """
+        vector = self._normalize(embedding)
+        record = (time.time(), list(results))
+        with self._lock:
+            entry = self._namespaces.get(namespace)
+            if entry is not None:
+                # Same query already cached (e.g. expired): replace it instead of adding a
+                # duplicate vector that would keep losing to the stale one in get()
+                score, position = self._closest(entry, vector)
+                if position >= 0 and score >= self.threshold:
+                    entry[1][position] = record
+                    return
+
+            if entry is None or entry[0].ntotal >= self.max_entries:
+                entry = (faiss.IndexFlatIP(self.dimension), [])
+                self._namespaces[namespace] = entry
+
+            index, records = entry
+            index.add(vector)
+            records.append(record)
+
+    def clear(self) -> None:
+        """Drop every cached entry (call whenever the indexed products change)."""
+        with self._lock:
+            if self._namespaces:
+                logger.info("Clearing semantic query cache")
+            self._namespaces.clear()
+
+    def get_statistics(self) -> Dict[str, int]:
+        """Get cache hit/miss counters and current size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": sum(index.ntotal for index, _ in self._namespaces.values())
+            }
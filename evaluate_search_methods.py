@@ -83,7 +83,7 @@ class SearchMethodsEvaluator:
         query = query_data["query"]
         
         # Measure execution time
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         try:
             if method in ["semantic", "keyword", "hybrid", "rrf"]:
@@ -103,7 +103,7 @@ class SearchMethodsEvaluator:
                 # Extract product IDs from the result dictionary
                 retrieved_ids = result_dict.get("results", [])
             
-            execution_time_ms = (time.time() - start_time) * 1000
+            execution_time_ms = (time.perf_counter() - start_time) * 1000
             
             return retrieved_ids, execution_time_ms
             
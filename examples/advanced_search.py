@@ -14,9 +14,6 @@ import sys
 import time
 from dotenv import load_dotenv
 
-# Add the parent directory to the path to import the core module
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 from core import ProductService, Product
 
 # Load environment variables
@@ -153,8 +150,7 @@ def test_search_weights(service):
         )
         
         print(f"{description} (BM25:{bm25_weight}, Vector:{vector_weight}):")
-        for i, product_id in enumerate(results[:3], 1):
-            product = service.get_product_by_id(product_id)
+        for i, product in enumerate(service.get_products_by_ids(results[:3]), 1):
             if product:
                 print(f"  {i}. {product.title}")
         print()
@@ -212,9 +208,9 @@ def performance_test(service):
         
         total_time = 0
         for query in queries:
-            start_time = time.time()
+            start_time = time.perf_counter()
             results = service.search_products(query, search_type=search_type, top_k=5)
-            end_time = time.time()
+            end_time = time.perf_counter()
             
             query_time = end_time - start_time
             total_time += query_time
@@ -248,8 +244,7 @@ def semantic_similarity_showcase(service):
         semantic_results = service.search_products(query, search_type="semantic", top_k=3)
         
         print("  Semantic results:")
-        for i, product_id in enumerate(semantic_results, 1):
-            product = service.get_product_by_id(product_id)
+        for i, product in enumerate(service.get_products_by_ids(semantic_results), 1):
             if product:
                 print(f"    {i}. {product.title}")
         
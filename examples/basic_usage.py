@@ -9,9 +9,6 @@ import os
 import sys
 from dotenv import load_dotenv
 
-# Add the parent directory to the path to import the core module
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 from core import ProductService, Product
 
 # Load environment variables
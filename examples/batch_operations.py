@@ -12,19 +12,20 @@ This script demonstrates efficient batch operations for large-scale product mana
 import os
 import sys
 import time
-import json
+import orjson
 from dotenv import load_dotenv
 
-# Add the parent directory to the path to import the core module
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 from core import ProductService, Product
 
 # Load environment variables
 load_dotenv()
 
-def generate_large_product_dataset():
-    """Generate a large dataset of products for batch testing."""
+def generate_large_product_dataset(limit=None):
+    """Generate a large dataset of products for batch testing.
+    
+    Args:
+        limit: Stop after this many products (all 200 products if None)
+    """
     
     categories = {
         "electronics": [
@@ -77,25 +78,27 @@ def generate_large_product_dataset():
         ]
     }
     
+    # Add variation to make each product unique
+    variations = [
+        "Pro", "Plus", "Max", "Ultra", "Premium", "Advanced", "Elite", "Professional",
+        "Deluxe", "Standard", "Essential", "Compact", "Wireless", "Smart", "Digital"
+    ]
+    
+    brands = [
+        "TechCorp", "InnovateTech", "QualityBrand", "PremiumCo", "ReliableTech",
+        "ModernDesign", "EliteManufacturing", "SmartSolutions", "ProGear", "NextGen"
+    ]
+    
     products_data = []
     product_id = 1
     
     # Generate products for each category
     for category, items in categories.items():
         for i in range(50):  # 50 products per category
-            item_type, base_description = items[i % len(items)]
-            
-            # Add variation to make each product unique
-            variations = [
-                "Pro", "Plus", "Max", "Ultra", "Premium", "Advanced", "Elite", "Professional",
-                "Deluxe", "Standard", "Essential", "Compact", "Wireless", "Smart", "Digital"
-            ]
-            
-            brands = [
-                "TechCorp", "InnovateTech", "QualityBrand", "PremiumCo", "ReliableTech",
-                "ModernDesign", "EliteManufacturing", "SmartSolutions", "ProGear", "NextGen"
-            ]
+            if limit is not None and len(products_data) >= limit:
+                return products_data
             
+            item_type, base_description = items[i % len(items)]
             variation = variations[i % len(variations)]
             brand = brands[i % len(brands)]
             
@@ -116,14 +119,14 @@ def benchmark_batch_vs_individual(service):
     print("=== Batch vs Individual Operations Benchmark ===\n")
     
     # Generate test data
-    test_products = generate_large_product_dataset()[:50]  # Use 50 products for testing
+    test_products = generate_large_product_dataset(limit=50)  # Use 50 products for testing
     
     # Clear existing data
     service.clear_all_data()
     
     # Test individual creation
     print("Testing individual product creation...")
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     for product_data in test_products:
         try:
@@ -131,7 +134,7 @@ def benchmark_batch_vs_individual(service):
         except Exception as e:
             print(f"Error creating product {product_data['id']}: {e}")
     
-    individual_time = time.time() - start_time
+    individual_time = time.perf_counter() - start_time
     individual_count = service.get_product_count()
     
     print(f"✅ Individual creation: {individual_time:.2f}s for {individual_count} products")
@@ -142,11 +145,11 @@ def benchmark_batch_vs_individual(service):
     
     # Test batch creation
     print("\nTesting batch product creation...")
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     try:
         batch_products = service.batch_create_products(test_products)
-        batch_time = time.time() - start_time
+        batch_time = time.perf_counter() - start_time
         batch_count = len(batch_products)
         
         print(f"✅ Batch creation: {batch_time:.2f}s for {batch_count} products")
@@ -179,25 +182,24 @@ def demonstrate_large_scale_operations(service):
     
     batch_size = 100
     total_created = 0
-    start_time = time.time()
+    start_time = time.perf_counter()
     
-    for i in range(0, len(large_dataset), batch_size):
-        batch = large_dataset[i:i + batch_size]
-        
-        try:
-            batch_products = service.batch_create_products(batch)
+    # Embeddings for the next batches are requested while the current one is indexed
+    try:
+        batches = service.stream_create_products(large_dataset, batch_size=batch_size)
+        for batch_number, batch_products in enumerate(batches, start=1):
             total_created += len(batch_products)
             
-            elapsed = time.time() - start_time
+            elapsed = time.perf_counter() - start_time
             rate = total_created / elapsed
             
-            print(f"  Batch {i//batch_size + 1}: {len(batch_products)} products created "
+            print(f"  Batch {batch_number}: {len(batch_products)} products created "
                   f"(Total: {total_created}, Rate: {rate:.1f} products/sec)")
             
-        except Exception as e:
-            print(f"  ❌ Batch {i//batch_size + 1} failed: {e}")
+    except Exception as e:
+        print(f"  ❌ Batch creation failed after {total_created} products: {e}")
     
-    total_time = time.time() - start_time
+    total_time = time.perf_counter() - start_time
     
     print(f"\n✅ Large scale creation complete:")
     print(f"   Total products: {total_created}")
@@ -215,12 +217,16 @@ def demonstrate_large_scale_operations(service):
         "programming book"
     ]
     
-    for query in search_queries:
-        start_time = time.time()
-        results = service.search_products(query, search_type="hybrid", top_k=10)
-        search_time = time.time() - start_time
-        
-        print(f"  '{query}': {search_time:.3f}s ({len(results)} results)")
+    # All queries in one pass: one embeddings request, one BM25 matrix product
+    start_time = time.perf_counter()
+    batch_results = service.batch_search_products(search_queries, search_type="hybrid", top_k=10)
+    search_time = time.perf_counter() - start_time
+
+    for query, results in zip(search_queries, batch_results):
+        print(f"  '{query}': {len(results)} results")
+
+    print(f"  Batch search: {search_time:.3f}s for {len(search_queries)} queries "
+          f"({search_time/len(search_queries):.3f}s per query)")
 
 def simulate_data_migration(service):
     """Simulate a data migration scenario."""
@@ -229,7 +235,7 @@ def simulate_data_migration(service):
     
     # Simulate existing data
     print("1. Creating initial dataset...")
-    initial_data = generate_large_product_dataset()[:100]
+    initial_data = generate_large_product_dataset(limit=100)
     service.clear_all_data()
     service.batch_create_products(initial_data)
     
@@ -242,27 +248,26 @@ def simulate_data_migration(service):
     export_data = [product.to_dict() for product in all_products]
     
     # Save to JSON file for demonstration
-    with open("data_export.json", "w") as f:
-        json.dump(export_data, f, indent=2)
+    with open("data_export.json", "wb") as f:
+        f.write(orjson.dumps(export_data, option=orjson.OPT_INDENT_2))
     
     print(f"✅ Exported {len(export_data)} products to data_export.json")
     
     # Simulate adding new data
     print("\n3. Preparing migration with new data...")
-    new_data = generate_large_product_dataset()[100:150]  # Next 50 products
+    new_data = generate_large_product_dataset(limit=150)[100:]  # Next 50 products
     
     # Combine existing and new data
     combined_data = export_data + new_data
     print(f"✅ Combined dataset: {len(combined_data)} products")
     
-    # Simulate migration (clear and rebuild)
+    # Simulate migration (incremental upsert: only the new products are embedded)
     print("\n4. Performing migration...")
-    start_time = time.time()
+    start_time = time.perf_counter()
     
-    service.clear_all_data()
     migrated_products = service.batch_create_products(combined_data)
     
-    migration_time = time.time() - start_time
+    migration_time = time.perf_counter() - start_time
     final_count = service.get_product_count()
     
     print(f"✅ Migration complete:")
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Precompute embeddings for the interactive demo sample data
+
+Run once (requires OPENAI_API_KEY) and whenever SAMPLE_PRODUCTS or the
+embedding model change. The interactive demo loads the resulting
+sample_embeddings.npz and indexes the sample catalog without calling the
+embeddings API.
+"""
+
+import numpy as np
+from dotenv import load_dotenv
+
+from core.config.settings import settings
+from core.services.embedding_service import EmbeddingService
+from interactive_demo import SAMPLE_EMBEDDINGS_PATH, SAMPLE_PRODUCTS, sample_texts
+
+# Load environment variables
+load_dotenv()
+
+def main():
+    texts = sample_texts()
+    print(f"Embedding {len(texts)} sample products with {settings.OPENAI_MODEL}...")
+
+    # One batched request for the whole sample catalog
+    embeddings = EmbeddingService().generate_embeddings_batch(texts)
+
+    np.savez(
+        SAMPLE_EMBEDDINGS_PATH,
+        embeddings=np.asarray(embeddings, dtype=np.float32),
+        texts=np.array(texts),
+        model=np.array(settings.OPENAI_MODEL)
+    )
+    print(f"✅ Saved {len(SAMPLE_PRODUCTS)} embeddings to {SAMPLE_EMBEDDINGS_PATH}")
+
+if __name__ == "__main__":
+    main()
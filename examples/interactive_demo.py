@@ -8,21 +8,181 @@ the semantic search functionality with real-time feedback.
 
 import os
 import sys
+import asyncio
+import inspect
+import numpy as np
 from dotenv import load_dotenv
 
-# Add the parent directory to the path to import the core module
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 from core import ProductService, Product
+from core.config.settings import settings
+
+try:
+    from prompt_toolkit import PromptSession
+except ImportError:  # prompt_toolkit is optional, prompts fall back to input() in a thread
+    PromptSession = None
 
 # Load environment variables
 load_dotenv()
 
+# Written by generate_sample_embeddings.py
+SAMPLE_EMBEDDINGS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sample_embeddings.npz")
+
+SAMPLE_PRODUCTS = [
+    {
+        "id": "tech-001",
+        "title": "MacBook Pro 16-inch",
+        "description": "Professional laptop with M2 chip, 32GB RAM, 1TB SSD. Perfect for developers, video editors, and creative professionals."
+    },
+    {
+        "id": "tech-002",
+        "title": "iPhone 15 Pro",
+        "description": "Latest iPhone with A17 Pro chip, titanium design, advanced camera system. Great for photography and mobile productivity."
+    },
+    {
+        "id": "tech-003",
+        "title": "Sony WH-1000XM5",
+        "description": "Premium wireless noise-canceling headphones with exceptional sound quality and 30-hour battery life."
+    },
+    {
+        "id": "tech-004",
+        "title": "iPad Pro 12.9",
+        "description": "Powerful tablet with M2 chip, Liquid Retina display, Apple Pencil support. Ideal for digital art and productivity."
+    },
+    {
+        "id": "tech-005",
+        "title": "Dell XPS 13",
+        "description": "Ultra-portable Windows laptop with Intel Core i7, 16GB RAM, 512GB SSD. Perfect for business professionals."
+    },
+    {
+        "id": "home-001",
+        "title": "Dyson V15 Detect",
+        "description": "Cordless vacuum cleaner with laser dust detection, HEPA filtration, and intelligent suction adjustment."
+    },
+    {
+        "id": "home-002",
+        "title": "Instant Pot Duo",
+        "description": "7-in-1 pressure cooker: pressure cook, slow cook, rice cooker, steamer, sauté, yogurt maker, and warmer."
+    },
+    {
+        "id": "home-003",
+        "title": "Nespresso Vertuo",
+        "description": "Coffee machine with centrifusion technology, one-touch brewing, and automatic capsule ejection."
+    },
+    {
+        "id": "fashion-001",
+        "title": "Nike Air Max 270",
+        "description": "Comfortable lifestyle sneakers with Max Air unit, breathable mesh upper, and modern design."
+    },
+    {
+        "id": "fashion-002",
+        "title": "Levi's 501 Jeans",
+        "description": "Classic straight-leg denim jeans with button fly, made from premium cotton. Timeless style."
+    },
+    {
+        "id": "book-001",
+        "title": "Clean Code",
+        "description": "A handbook of agile software craftsmanship. Essential reading for programmers and software developers."
+    },
+    {
+        "id": "book-002",
+        "title": "Atomic Habits",
+        "description": "Practical guide to building good habits and breaking bad ones. Proven strategies for personal development."
+    }
+]
+
+
+# Menu and help screens are rendered with a single write each
+_MENU_STR = "\n".join([
+    "",
+    "=" * 60,
+    "🔍 SEMANTIC SEARCH INTERACTIVE DEMO",
+    "=" * 60,
+    "1. Search products",
+    "2. Add new product",
+    "3. Update product",
+    "4. Delete product",
+    "5. List all products",
+    "6. Compare search methods",
+    "7. Test custom weights",
+    "8. System statistics",
+    "9. Help",
+    "0. Exit",
+    "=" * 60,
+    ""
+])
+
+_HELP_STR = "\n".join([
+    "",
+    "❓ HELP",
+    "-" * 30,
+    "This interactive demo allows you to explore the semantic search functionality:",
+    "",
+    "🔍 SEARCH METHODS:",
+    "  • Hybrid: Combines keyword (BM25) and semantic (vector) search",
+    "  • Semantic: Uses only vector embeddings for meaning-based search",
+    "  • Keyword: Uses only BM25 for exact keyword matching",
+    "",
+    "⚖️ SEARCH WEIGHTS:",
+    "  • BM25 weight: Controls keyword matching influence (0.0-1.0)",
+    "  • Vector weight: Controls semantic matching influence (0.0-1.0)",
+    "  • Weights are automatically normalized",
+    "",
+    "💡 TIPS:",
+    "  • Try semantic search for conceptual queries like 'portable computer'",
+    "  • Use keyword search for exact phrase matching",
+    "  • Hybrid search usually provides the best overall results",
+    "  • Experiment with different weights to tune search behavior",
+    ""
+])
+
+
+def sample_texts():
+    """Combined text of each sample product, exactly as it is embedded by the index."""
+    return [
+        Product(id=data["id"], title=data["title"], description=data["description"]).get_combined_text()
+        for data in SAMPLE_PRODUCTS
+    ]
+
+
+def load_sample_embeddings():
+    """Load precomputed sample embeddings, or None if missing or stale."""
+    if not os.path.exists(SAMPLE_EMBEDDINGS_PATH):
+        return None
+    
+    with np.load(SAMPLE_EMBEDDINGS_PATH) as stored:
+        if (
+            str(stored["model"]) != settings.OPENAI_MODEL
+            or stored["texts"].tolist() != sample_texts()
+            or stored["embeddings"].shape[1] != settings.VECTOR_DIMENSION
+        ):
+            print("⚠️  sample_embeddings.npz is out of date, embedding sample data with OpenAI")
+            return None
+        return stored["embeddings"]
+
 class InteractiveDemo:
     def __init__(self):
         self.service = ProductService()
+        self.session = PromptSession() if PromptSession is not None else None
+        # Menu option -> action ("0" exits the loop in run)
+        self._dispatch = {
+            "1": self.search_products,
+            "2": self.add_product,
+            "3": self.update_product,
+            "4": self.delete_product,
+            "5": self.list_products,
+            "6": self.compare_search_methods,
+            "7": self.test_custom_weights,
+            "8": self.show_statistics,
+            "9": self.show_help
+        }
         self.setup_sample_data()
     
+    async def ask(self, message: str) -> str:
+        """Read a line without blocking the event loop."""
+        if self.session is not None:
+            return await self.session.prompt_async(message)
+        return await asyncio.to_thread(input, message)
+    
     def setup_sample_data(self):
         """Setup sample data for the demo."""
         print("Setting up sample data...")
@@ -30,98 +190,27 @@ class InteractiveDemo:
         # Clear existing data
         self.service.clear_all_data()
         
-        sample_products = [
-            {
-                "id": "tech-001",
-                "title": "MacBook Pro 16-inch",
-                "description": "Professional laptop with M2 chip, 32GB RAM, 1TB SSD. Perfect for developers, video editors, and creative professionals."
-            },
-            {
-                "id": "tech-002",
-                "title": "iPhone 15 Pro",
-                "description": "Latest iPhone with A17 Pro chip, titanium design, advanced camera system. Great for photography and mobile productivity."
-            },
-            {
-                "id": "tech-003",
-                "title": "Sony WH-1000XM5",
-                "description": "Premium wireless noise-canceling headphones with exceptional sound quality and 30-hour battery life."
-            },
-            {
-                "id": "tech-004",
-                "title": "iPad Pro 12.9",
-                "description": "Powerful tablet with M2 chip, Liquid Retina display, Apple Pencil support. Ideal for digital art and productivity."
-            },
-            {
-                "id": "tech-005",
-                "title": "Dell XPS 13",
-                "description": "Ultra-portable Windows laptop with Intel Core i7, 16GB RAM, 512GB SSD. Perfect for business professionals."
-            },
-            {
-                "id": "home-001",
-                "title": "Dyson V15 Detect",
-                "description": "Cordless vacuum cleaner with laser dust detection, HEPA filtration, and intelligent suction adjustment."
-            },
-            {
-                "id": "home-002",
-                "title": "Instant Pot Duo",
-                "description": "7-in-1 pressure cooker: pressure cook, slow cook, rice cooker, steamer, sauté, yogurt maker, and warmer."
-            },
-            {
-                "id": "home-003",
-                "title": "Nespresso Vertuo",
-                "description": "Coffee machine with centrifusion technology, one-touch brewing, and automatic capsule ejection."
-            },
-            {
-                "id": "fashion-001",
-                "title": "Nike Air Max 270",
-                "description": "Comfortable lifestyle sneakers with Max Air unit, breathable mesh upper, and modern design."
-            },
-            {
-                "id": "fashion-002",
-                "title": "Levi's 501 Jeans",
-                "description": "Classic straight-leg denim jeans with button fly, made from premium cotton. Timeless style."
-            },
-            {
-                "id": "book-001",
-                "title": "Clean Code",
-                "description": "A handbook of agile software craftsmanship. Essential reading for programmers and software developers."
-            },
-            {
-                "id": "book-002",
-                "title": "Atomic Habits",
-                "description": "Practical guide to building good habits and breaking bad ones. Proven strategies for personal development."
-            }
-        ]
+        # Precomputed embeddings (generate_sample_embeddings.py) skip the embeddings API
+        embeddings = load_sample_embeddings()
         
         try:
-            self.service.batch_create_products(sample_products)
-            print(f"✅ Sample data loaded: {len(sample_products)} products")
+            self.service.batch_create_products(SAMPLE_PRODUCTS, embeddings=embeddings)
+            source = "precomputed embeddings" if embeddings is not None else "OpenAI embeddings"
+            print(f"✅ Sample data loaded: {len(SAMPLE_PRODUCTS)} products ({source})")
         except Exception as e:
             print(f"❌ Error loading sample data: {e}")
     
     def display_menu(self):
         """Display the main menu."""
-        print("\n" + "="*60)
-        print("🔍 SEMANTIC SEARCH INTERACTIVE DEMO")
-        print("="*60)
-        print("1. Search products")
-        print("2. Add new product")
-        print("3. Update product")
-        print("4. Delete product")
-        print("5. List all products")
-        print("6. Compare search methods")
-        print("7. Test custom weights")
-        print("8. System statistics")
-        print("9. Help")
-        print("0. Exit")
-        print("="*60)
+        sys.stdout.write(_MENU_STR)
+        sys.stdout.flush()
     
-    def search_products(self):
+    async def search_products(self):
         """Interactive product search."""
         print("\n🔍 PRODUCT SEARCH")
         print("-" * 30)
         
-        query = input("Enter search query: ").strip()
+        query = (await self.ask("Enter search query: ")).strip()
         if not query:
             print("❌ Query cannot be empty")
             return
@@ -131,7 +220,7 @@ class InteractiveDemo:
         print("2. Semantic only")
         print("3. Keyword only")
         
-        method_choice = input("Choose search method (1-3, default=1): ").strip()
+        method_choice = (await self.ask("Choose search method (1-3, default=1): ")).strip()
         
         search_type_map = {
             "1": "hybrid",
@@ -143,7 +232,7 @@ class InteractiveDemo:
         search_type = search_type_map.get(method_choice, "hybrid")
         
         try:
-            top_k = int(input("Number of results (default=5): ").strip() or "5")
+            top_k = int((await self.ask("Number of results (default=5): ")).strip() or "5")
         except ValueError:
             top_k = 5
         
@@ -154,8 +243,7 @@ class InteractiveDemo:
             
             if results:
                 print(f"\n✅ Found {len(results)} results:")
-                for i, product_id in enumerate(results, 1):
-                    product = self.service.get_product_by_id(product_id)
+                for i, product in enumerate(self.service.get_products_by_ids(results), 1):
                     if product:
                         print(f"\n{i}. {product.title} (ID: {product.id})")
                         print(f"   {product.description}")
@@ -165,22 +253,22 @@ class InteractiveDemo:
         except Exception as e:
             print(f"❌ Search error: {e}")
     
-    def add_product(self):
+    async def add_product(self):
         """Interactive product addition."""
         print("\n➕ ADD NEW PRODUCT")
         print("-" * 30)
         
-        product_id = input("Product ID: ").strip()
+        product_id = (await self.ask("Product ID: ")).strip()
         if not product_id:
             print("❌ Product ID cannot be empty")
             return
         
-        title = input("Product title: ").strip()
+        title = (await self.ask("Product title: ")).strip()
         if not title:
             print("❌ Product title cannot be empty")
             return
         
-        description = input("Product description: ").strip()
+        description = (await self.ask("Product description: ")).strip()
         if not description:
             print("❌ Product description cannot be empty")
             return
@@ -194,12 +282,12 @@ class InteractiveDemo:
         except Exception as e:
             print(f"❌ Error creating product: {e}")
     
-    def update_product(self):
+    async def update_product(self):
         """Interactive product update."""
         print("\n✏️ UPDATE PRODUCT")
         print("-" * 30)
         
-        product_id = input("Product ID to update: ").strip()
+        product_id = (await self.ask("Product ID to update: ")).strip()
         if not product_id:
             print("❌ Product ID cannot be empty")
             return
@@ -216,8 +304,8 @@ class InteractiveDemo:
         
         print(f"\nEnter new values (press Enter to keep current):")
         
-        new_title = input(f"New title [{existing_product.title}]: ").strip()
-        new_description = input(f"New description [{existing_product.description}]: ").strip()
+        new_title = (await self.ask(f"New title [{existing_product.title}]: ")).strip()
+        new_description = (await self.ask(f"New description [{existing_product.description}]: ")).strip()
         
         if not new_title and not new_description:
             print("❌ No changes provided")
@@ -237,12 +325,12 @@ class InteractiveDemo:
         except Exception as e:
             print(f"❌ Error updating product: {e}")
     
-    def delete_product(self):
+    async def delete_product(self):
         """Interactive product deletion."""
         print("\n🗑️ DELETE PRODUCT")
         print("-" * 30)
         
-        product_id = input("Product ID to delete: ").strip()
+        product_id = (await self.ask("Product ID to delete: ")).strip()
         if not product_id:
             print("❌ Product ID cannot be empty")
             return
@@ -257,7 +345,7 @@ class InteractiveDemo:
         print(f"  ID: {existing_product.id}")
         print(f"  Title: {existing_product.title}")
         
-        confirm = input("\nAre you sure you want to delete this product? (y/N): ").strip().lower()
+        confirm = (await self.ask("\nAre you sure you want to delete this product? (y/N): ")).strip().lower()
         
         if confirm == 'y':
             try:
@@ -276,26 +364,27 @@ class InteractiveDemo:
         products = self.service.list_all_products()
         
         if products:
-            print(f"Total products: {len(products)}\n")
+            lines = [f"Total products: {len(products)}\n"]
             for i, product in enumerate(products, 1):
-                print(f"{i}. {product.title} (ID: {product.id})")
-                print(f"   {product.description[:100]}{'...' if len(product.description) > 100 else ''}")
-                print()
+                lines.append(f"{i}. {product.title} (ID: {product.id})")
+                lines.append(f"   {product.description[:100]}{'...' if len(product.description) > 100 else ''}\n")
+            sys.stdout.write("\n".join(lines) + "\n")
+            sys.stdout.flush()
         else:
             print("❌ No products found")
     
-    def compare_search_methods(self):
+    async def compare_search_methods(self):
         """Compare different search methods."""
         print("\n🔍 SEARCH METHOD COMPARISON")
         print("-" * 30)
         
-        query = input("Enter search query: ").strip()
+        query = (await self.ask("Enter search query: ")).strip()
         if not query:
             print("❌ Query cannot be empty")
             return
         
         try:
-            top_k = int(input("Number of results per method (default=3): ").strip() or "3")
+            top_k = int((await self.ask("Number of results per method (default=3): ")).strip() or "3")
         except ValueError:
             top_k = 3
         
@@ -308,36 +397,38 @@ class InteractiveDemo:
             ("Keyword", "keyword")
         ]
         
+        try:
+            # One embedding and one pass over each index for the three rankings
+            rankings = self.service.search_all_methods(query, top_k=top_k)
+        except Exception as e:
+            print(f"  ❌ Error: {e}")
+            return
+        
         for method_name, method_type in methods:
-            try:
-                results = self.service.search_products(query, search_type=method_type, top_k=top_k)
-                
-                print(f"\n{method_name} Search:")
-                if results:
-                    for i, product_id in enumerate(results, 1):
-                        product = self.service.get_product_by_id(product_id)
-                        if product:
-                            print(f"  {i}. {product.title}")
-                else:
-                    print("  No results found")
-                    
-            except Exception as e:
-                print(f"  ❌ Error: {e}")
+            results = rankings[method_type]
+            
+            print(f"\n{method_name} Search:")
+            if results:
+                for i, product in enumerate(self.service.get_products_by_ids(results), 1):
+                    if product:
+                        print(f"  {i}. {product.title}")
+            else:
+                print("  No results found")
     
-    def test_custom_weights(self):
+    async def test_custom_weights(self):
         """Test custom weight configurations."""
         print("\n⚖️ CUSTOM WEIGHT TESTING")
         print("-" * 30)
         
-        query = input("Enter search query: ").strip()
+        query = (await self.ask("Enter search query: ")).strip()
         if not query:
             print("❌ Query cannot be empty")
             return
         
         try:
-            bm25_weight = float(input("BM25 weight (0.0-1.0, default=0.4): ").strip() or "0.4")
-            vector_weight = float(input("Vector weight (0.0-1.0, default=0.6): ").strip() or "0.6")
-            top_k = int(input("Number of results (default=5): ").strip() or "5")
+            bm25_weight = float((await self.ask("BM25 weight (0.0-1.0, default=0.4): ")).strip() or "0.4")
+            vector_weight = float((await self.ask("Vector weight (0.0-1.0, default=0.6): ")).strip() or "0.6")
+            top_k = int((await self.ask("Number of results (default=5): ")).strip() or "5")
         except ValueError:
             print("❌ Invalid input. Using default values.")
             bm25_weight, vector_weight, top_k = 0.4, 0.6, 5
@@ -358,8 +449,7 @@ class InteractiveDemo:
             
             if results:
                 print(f"\n✅ Found {len(results)} results:")
-                for i, product_id in enumerate(results, 1):
-                    product = self.service.get_product_by_id(product_id)
+                for i, product in enumerate(self.service.get_products_by_ids(results), 1):
                     if product:
                         print(f"  {i}. {product.title}")
             else:
@@ -389,27 +479,10 @@ class InteractiveDemo:
     
     def show_help(self):
         """Show help information."""
-        print("\n❓ HELP")
-        print("-" * 30)
-        print("This interactive demo allows you to explore the semantic search functionality:")
-        print()
-        print("🔍 SEARCH METHODS:")
-        print("  • Hybrid: Combines keyword (BM25) and semantic (vector) search")
-        print("  • Semantic: Uses only vector embeddings for meaning-based search")
-        print("  • Keyword: Uses only BM25 for exact keyword matching")
-        print()
-        print("⚖️ SEARCH WEIGHTS:")
-        print("  • BM25 weight: Controls keyword matching influence (0.0-1.0)")
-        print("  • Vector weight: Controls semantic matching influence (0.0-1.0)")
-        print("  • Weights are automatically normalized")
-        print()
-        print("💡 TIPS:")
-        print("  • Try semantic search for conceptual queries like 'portable computer'")
-        print("  • Use keyword search for exact phrase matching")
-        print("  • Hybrid search usually provides the best overall results")
-        print("  • Experiment with different weights to tune search behavior")
+        sys.stdout.write(_HELP_STR)
+        sys.stdout.flush()
     
-    def run(self):
+    async def run(self):
         """Run the interactive demo."""
         print("🚀 Starting Semantic Search Interactive Demo...")
         print("Type 'help' or choose option 9 for guidance.")
@@ -417,33 +490,21 @@ class InteractiveDemo:
         while True:
             self.display_menu()
             
-            choice = input("\nEnter your choice (0-9): ").strip()
+            choice = (await self.ask("\nEnter your choice (0-9): ")).strip()
             
             if choice == "0":
                 print("\n👋 Thank you for using the Semantic Search Demo!")
                 break
-            elif choice == "1":
-                self.search_products()
-            elif choice == "2":
-                self.add_product()
-            elif choice == "3":
-                self.update_product()
-            elif choice == "4":
-                self.delete_product()
-            elif choice == "5":
-                self.list_products()
-            elif choice == "6":
-                self.compare_search_methods()
-            elif choice == "7":
-                self.test_custom_weights()
-            elif choice == "8":
-                self.show_statistics()
-            elif choice == "9":
-                self.show_help()
-            else:
+            
+            handler = self._dispatch.get(choice)
+            if handler is None:
                 print("❌ Invalid choice. Please select 0-9.")
+            elif inspect.iscoroutinefunction(handler):
+                await handler()
+            else:
+                handler()
             
-            input("\nPress Enter to continue...")
+            await self.ask("\nPress Enter to continue...")
 
 def main():
     print("=== Semantic Search Core Module - Interactive Demo ===\n")
@@ -457,7 +518,7 @@ def main():
     
     try:
         demo = InteractiveDemo()
-        demo.run()
+        asyncio.run(demo.run())
     except KeyboardInterrupt:
         print("\n\n⏹️  Demo interrupted by user")
     except Exception as e:
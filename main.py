@@ -1,22 +1,18 @@
+import asyncio
 import logging
 import sys
-from pathlib import Path
+import time
+import orjson
 from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
-# al inicio
 from fastapi.staticfiles import StaticFiles
-from pathlib import Path
-
-# Add the project root to the Python path
-sys.path.append(str(Path(__file__).parent))
 
 from api.routers import products_router, search_router
 from api.middleware import setup_middleware
-from api.dependencies import get_product_service
-from api.models.responses import ErrorResponse
+from api.dependencies import get_product_service, is_product_service_loading, is_product_service_ready
 
 # Configure logging
 logging.basicConfig(
@@ -29,6 +25,31 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# Timestamp shared by /health and the error handlers, refreshed at most once per second
+_TS_CACHE = {"t": 0.0, "s": ""}
+
+
+def _now_iso() -> str:
+    """Current UTC time as ISO 8601, cached with 1 second granularity."""
+    t = time.time()
+    if t - _TS_CACHE["t"] >= 1.0:
+        _TS_CACHE.update(t=t, s=datetime.fromtimestamp(t, timezone.utc).isoformat())
+    return _TS_CACHE["s"]
+
+
+def _initialize_service():
+    """Build the ProductService (loads FAISS and BM25 indexes from disk)."""
+    service = get_product_service()
+    stats = service.get_search_statistics()
+    logger.info(f"Service initialized successfully. Stats: {stats}")
+    return service
+
+
+def _on_service_initialized(task: asyncio.Future):
+    """Log the outcome of the background initialization."""
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Failed to initialize service: {task.exception()}")
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -36,17 +57,14 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting up Semantic Search API...")
     
+    # Load the indexes in a worker thread so uvicorn binds the socket right away;
+    # requests arriving meanwhile wait in get_product_service until it finishes
+    loop = asyncio.get_running_loop()
+    app.state.service_task = loop.run_in_executor(None, _initialize_service)
+    app.state.service_task.add_done_callback(_on_service_initialized)
+    
     try:
-        # Initialize the ProductService to ensure everything is working
-        service = get_product_service()
-        stats = service.get_search_statistics()
-        logger.info(f"Service initialized successfully. Stats: {stats}")
-        
         yield
-        
-    except Exception as e:
-        logger.error(f"Failed to initialize service: {e}")
-        raise
     
     finally:
         # Shutdown
@@ -97,6 +115,7 @@ app = FastAPI(
         "name": "MIT",
         "url": "https://opensource.org/licenses/MIT",
     },
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -108,24 +127,58 @@ app.include_router(products_router, prefix="/api/v1")
 app.include_router(search_router, prefix="/api/v1")
 
 
+def _orjson_default(obj):
+    """Encode values orjson has no native support for (raw bodies, error contexts)."""
+    if isinstance(obj, bytes):
+        return obj.decode("utf-8", errors="replace")
+    return str(obj)
+
+
+class ValidationErrorResponse(ORJSONResponse):
+    """ORJSONResponse that also accepts the raw objects found in validation errors."""
+    
+    def render(self, content) -> bytes:
+        return orjson.dumps(
+            content,
+            default=_orjson_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+
+
+def _error_content(request: Request, error: str, message: str, details: dict = None) -> dict:
+    """
+    Build an error body with the ErrorResponse schema.
+
+    The dict is handed straight to ORJSONResponse, skipping Pydantic
+    validation and model_dump on every error response.
+    """
+    return {
+        "error": error,
+        "message": message,
+        "details": details,
+        "timestamp": _now_iso(),
+        "request_id": getattr(request.state, 'request_id', None)
+    }
+
+
 # Global exception handlers
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """Handle validation errors."""
     logger.warning(f"Validation error: {exc}")
     
-    return JSONResponse(
+    # orjson encodes the details in C; only unsupported values go through the default hook
+    return ValidationErrorResponse(
         status_code=422,
-        content=ErrorResponse(
-            error="ValidationError",
-            message="Request validation failed",
+        content=_error_content(
+            request,
+            "ValidationError",
+            "Request validation failed",
             details={
                 "errors": exc.errors(),
                 "body": exc.body
-            },
-            #timestamp=datetime.now(timezone.utc),
-            request_id=getattr(request.state, 'request_id', None)
-        ).model_dump(mode='json')
+            }
+        )
     )
 
 
@@ -134,14 +187,9 @@ async def http_exception_handler(request: Request, exc: HTTPException):
     """Handle HTTP exceptions."""
     logger.warning(f"HTTP exception: {exc.status_code} - {exc.detail}")
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
-        content=ErrorResponse(
-            error=f"HTTP{exc.status_code}",
-            message=exc.detail,
-            #timestamp=datetime.now(timezone.utc),
-            request_id=getattr(request.state, 'request_id', None)
-        ).model_dump(mode='json')
+        content=_error_content(request, f"HTTP{exc.status_code}", exc.detail)
     )
 
 
@@ -150,14 +198,9 @@ async def general_exception_handler(request: Request, exc: Exception):
     """Handle all other exceptions."""
     logger.error(f"Unhandled exception: {exc}", exc_info=True)
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
-        content=ErrorResponse(
-            error="InternalServerError",
-            message="An unexpected error occurred",
-            #timestamp=datetime.now(timezone.utc),
-            request_id=getattr(request.state, 'request_id', None)
-        ).model_dump(mode='json')
+        content=_error_content(request, "InternalServerError", "An unexpected error occurred")
     )
 
 
@@ -186,32 +229,61 @@ async def root():
 @app.get("/health",
     summary="Health Check",
     description="Basic health check endpoint")
-async def health():
-    """Basic health check."""
+async def health(request: Request):
+    """Basic health check. Answers 503 until the indexes are loaded."""
+    task = getattr(request.app.state, "service_task", None)
+    # Go by the service itself: a later request may succeed where the startup load failed
+    if task is not None and not is_product_service_ready():
+        starting = not task.done() or is_product_service_loading()
+        return ORJSONResponse(
+            status_code=503,
+            content={
+                "status": "starting" if starting else "unhealthy",
+                "timestamp": _now_iso(),
+                "service": "semantic-search-api"
+            }
+        )
+    
     return {
         "status": "healthy",
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "timestamp": _now_iso(),
         "service": "semantic-search-api"
     }
 
 
 if __name__ == "__main__":
+    import os
     import uvicorn
     import argparse
 
+    # PROD=1 switches reload off by default. Several workers are opt-in only (WORKERS or
+    # --workers): each one holds private copies of the indexes, caches and models
+    production = os.getenv("PROD") == "1"
+    default_workers = int(os.getenv("WORKERS", 1))
+
     parser = argparse.ArgumentParser(description="Run the Semantic Search API server.")
     parser.add_argument("--host", type=str, default="0.0.0.0", help="Host to bind the server to.")
     parser.add_argument("--port", type=int, default=8000, help="Port to bind the server to.")
+    parser.add_argument("--reload", action=argparse.BooleanOptionalAction, default=not production,
+                        help="Restart on code changes (development). Off by default when PROD=1.")
+    parser.add_argument("--workers", type=int, default=default_workers,
+                        help="Number of worker processes (reload is disabled when greater than 1). "
+                             "Each worker holds its own in-memory indexes, so more than 1 is only "
+                             "safe for read-only indexes. Defaults to WORKERS, or 1.")
     args = parser.parse_args()
     
-    # Run the server
-    uvicorn.run(
-        "main:app",
-        host=args.host,
-        port=args.port,
-        reload=True,
-        log_level="info",
-        reload_excludes=[
+    if args.workers > 1:
+        logger.warning(
+            f"Running {args.workers} workers: each one loads its own models and indexes. "
+            "Product writes (create/update/delete/load) only reach the worker that served them "
+            "and every worker saves to the same index files; use a single worker unless the "
+            "indexes are read-only."
+        )
+    
+    # The file watcher cannot be combined with several workers
+    reload = args.reload and args.workers == 1
+    reload_options = {
+        "reload_excludes": [
             "*.log",
             "*.faiss", 
             "*.pkl",
@@ -226,4 +298,18 @@ if __name__ == "__main__":
             "vector_store/*",
             "bm25_store/*"
         ]
+    } if reload else {}
+    
+    # Run the server. "auto" picks uvloop + httptools when installed (uvicorn[standard]),
+    # and falls back to asyncio + h11 where they are unavailable (e.g. Windows).
+    uvicorn.run(
+        "main:app",
+        host=args.host,
+        port=args.port,
+        reload=reload,
+        workers=args.workers,
+        loop="auto",
+        http="auto",
+        log_level="info",
+        **reload_options
     ) 
\ No newline at end of file
@@ -53,34 +53,38 @@ data = {
 
 # Crear DataFrame
 df = pd.DataFrame(data)
+# Una sola conversión a NumPy; rankings, estadísticos y resúmenes se calculan sobre arr
+arr = df.to_numpy(dtype=np.float64)
+methods = df.columns.to_numpy()
 
 print("=" * 80)
 print("PRUEBA DE FRIEDMAN - COMPARACIÓN DE TIEMPOS DE BÚSQUEDA")
 print("=" * 80)
 print("SUPUESTO: MENOR valor = MEJOR rendimiento (tiempos más bajos)")
 
-# 1. Calcular rankings por fila (MENOR valor = mejor = rango 1)
-ranked_data = df.rank(axis=1, ascending=True, method='average')
+# 1. Calcular rankings por fila (MENOR valor = mejor = rango 1), vectorizado en NumPy
+ranks = stats.rankdata(arr, axis=1, method='average')
+ranked_data = pd.DataFrame(ranks, columns=methods)
 
 print("\n" + "=" * 50)
 print("RANKINGS POR FILA (1 = mejor tiempo, 9 = peor tiempo)")
 print("=" * 50)
 
 # 2. Calcular suma de rangos por método
-rank_sums = ranked_data.sum()
-average_ranks = rank_sums / len(df)
+rank_sums = ranks.sum(axis=0)
+average_ranks = ranks.mean(axis=0)
 
 print("\nSUMA DE RANGOS POR MÉTODO:")
 print("-" * 50)
-for method, sum_rank in rank_sums.items():
-    print(f"{method:25s}: {sum_rank:8.2f} (Promedio: {average_ranks[method]:.2f})")
+for method, sum_rank, average_rank in zip(methods, rank_sums, average_ranks):
+    print(f"{method:25s}: {sum_rank:8.2f} (Promedio: {average_rank:.2f})")
 
 # 3. Prueba de Friedman usando scipy
 print("\n" + "=" * 50)
 print("PRUEBA DE FRIEDMAN - RESULTADOS")
 print("=" * 50)
 
-friedman_stat, p_value = stats.friedmanchisquare(*[df[col] for col in df.columns])
+friedman_stat, p_value = stats.friedmanchisquare(*arr.T)
 
 print(f"Estadístico de Friedman (χ²): {friedman_stat:.6f}")
 print(f"Valor p: {p_value:.20f}")
@@ -111,15 +115,14 @@ try:
     print(f"\nDIFERENCIAS SIGNIFICATIVAS (p < {alpha}):")
     print("-" * 60)
     
-    significant_pairs = []
-    methods = df.columns
-    
-    for i in range(len(methods)):
-        for j in range(i+1, len(methods)):
-            p_val = nemenyi_result.iloc[i, j]
-            if p_val < alpha:
-                significant_pairs.append((methods[i], methods[j], p_val, 
-                                        average_ranks[i], average_ranks[j]))
+    # Triángulo superior de la matriz (pares i < j) filtrado con una sola máscara
+    p_matrix = nemenyi_result.to_numpy()
+    rows, cols = np.triu_indices(len(methods), k=1)
+    p_pairs = p_matrix[rows, cols]
+    mask = p_pairs < alpha
+    rows, cols = rows[mask], cols[mask]
+    significant_pairs = list(zip(methods[rows], methods[cols], p_pairs[mask],
+                                 average_ranks[rows], average_ranks[cols]))
     
     if significant_pairs:
         print(f"Se encontraron {len(significant_pairs)} pares significativos:")
@@ -139,11 +142,11 @@ print("RESUMEN DE RENDIMIENTO (ordenado por eficiencia)")
 print("=" * 50)
 
 performance_summary = pd.DataFrame({
-    'Método': df.columns,
+    'Método': methods,
     'Suma_Rangos': rank_sums,
     'Ranking_Promedio': average_ranks,
-    'Mediana_Tiempo': df.median(),
-    'Media_Tiempo': df.mean()
+    'Mediana_Tiempo': np.median(arr, axis=0),
+    'Media_Tiempo': arr.mean(axis=0)
 })
 
 # Ordenar de MEJOR a PEOR (ranking promedio más bajo = mejor)
@@ -4,28 +4,37 @@ Production-like server runner for the Semantic Search API
 This runs the server without auto-reload to avoid file watching issues
 """
 
-import uvicorn
-import sys
+import os
 from pathlib import Path
-
-# Add the project root to the Python path
-sys.path.append(str(Path(__file__).parent))
+import uvicorn
 
 if __name__ == "__main__":
+    # Single worker unless WORKERS is set. Each worker loads its own models and keeps private
+    # copies of the indexes and caches, so more than one is only safe for read-only indexes
+    workers = int(os.getenv("WORKERS", 1))
+    
     print("🚀 Starting Semantic Search API (Production Mode)")
     print("=" * 50)
     print("📍 Server will run on: http://localhost:8000")
     print("📖 API Documentation: http://localhost:8000/docs")
     print("🔍 Health Check: http://localhost:8000/health")
     print("⚠️  Auto-reload is DISABLED for stability")
-    print("=" * 50)
+    print(f"👷 Workers: {workers}")
+    if workers > 1:
+        print("⚠️  Several workers: product writes only reach one worker and all of them")
+        print("   save to the same index files. Use WORKERS>1 with read-only indexes only")
+    print("=" * 50, flush=True)
     
-    # Run the server without auto-reload
+    # Run the server without auto-reload. app_dir resolves main:app from this script's folder
+    # whatever the working directory; uvicorn[standard] provides uvloop and httptools, which
+    # the default "auto" loop/http pick
     uvicorn.run(
         "main:app",
+        app_dir=str(Path(__file__).parent),
         host="0.0.0.0",
         port=8000,
+        workers=workers,
         reload=False,  # Disabled for stability
         log_level="info",
         access_log=True
-    ) 
\ No newline at end of file
+    )
@@ -6,21 +6,41 @@ Tests all endpoints and functionality.
 
 import asyncio
 import json
+import secrets
 import time
-from typing import Dict, Any
+from contextvars import ContextVar
+from typing import Dict, Any, Optional
 import httpx
+import orjson
 from datetime import datetime
 
+try:
+    import uvloop
+except ImportError:  # uvloop is optional (POSIX only, comes with uvicorn[standard]), falls back to asyncio's loop
+    uvloop = None
+
 # Configuration
 BASE_URL = "http://localhost:8000"
 API_KEY = "test-api-key-1234567890"  # For testing endpoints that require auth
 
+# Output lines of the test running in the current task (None: print right away)
+_report_buffer: ContextVar[Optional[list]] = ContextVar("_report_buffer", default=None)
+
 class APITester:
     def __init__(self, base_url: str, api_key: str = None):
         self.base_url = base_url
         self.api_key = api_key
-        self.client = httpx.AsyncClient(timeout=30.0)
+        # One pooled keep-alive client; json= requests set their own Content-Type
+        self.client = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
+        )
         self.test_products = []
+        # Per-run suffix for test product IDs, so leftovers from an aborted run never conflict
+        self._suite = secrets.token_hex(4)
+        # Per-request headers are fixed for the run: build them once (callers must not mutate them)
+        self._headers_noauth = {}
+        self._headers_auth = {"Authorization": f"Bearer {api_key}"} if api_key else {}
         
     async def __aenter__(self):
         return self
@@ -29,42 +49,67 @@ class APITester:
         await self.client.aclose()
     
     def get_headers(self, auth_required: bool = False) -> Dict[str, str]:
-        """Get headers for requests."""
-        headers = {"Content-Type": "application/json"}
-        if auth_required and self.api_key:
-            headers["Authorization"] = f"Bearer {self.api_key}"
-        return headers
+        """Get per-request headers (Content-Type comes from json=)."""
+        return self._headers_auth if auth_required else self._headers_noauth
+    
+    def _report(self, message: str):
+        """Print a progress line, or keep it for later when the test runs concurrently."""
+        buffer = _report_buffer.get()
+        if buffer is None:
+            print(message)
+        else:
+            buffer.append(message)
+    
+    async def _buffered(self, test):
+        """Run a test, keeping its output; returns (lines, exception or None)."""
+        # gather runs each coroutine in its own task, with its own copy of the context
+        lines = []
+        _report_buffer.set(lines)
+        try:
+            await test()
+        except Exception as e:
+            return lines, e
+        return lines, None
+    
+    async def _await_indexed(self, expected_total: int, timeout: float = 5.0):
+        """Poll search statistics until the indexes hold at least expected_total products."""
+        deadline = time.perf_counter() + timeout
+        while time.perf_counter() < deadline:
+            response = await self.client.get(f"{self.base_url}/api/v1/search/stats")
+            if response.status_code == 200 and orjson.loads(response.content)["total_products"] >= expected_total:
+                return
+            await asyncio.sleep(0.05)
     
     async def test_health_check(self):
         """Test health check endpoints."""
-        print("🔍 Testing health check endpoints...")
+        self._report("🔍 Testing health check endpoints...")
         
         # Root health check
         response = await self.client.get(f"{self.base_url}/health")
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
         assert data["status"] == "healthy"
-        print("✅ Root health check passed")
+        self._report("✅ Root health check passed")
         
         # Detailed health check
         response = await self.client.get(f"{self.base_url}/api/v1/search/health")
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
         assert "status" in data
         assert "dependencies" in data
-        print("✅ Detailed health check passed")
+        self._report("✅ Detailed health check passed")
     
     async def test_root_endpoint(self):
         """Test root endpoint."""
-        print("🔍 Testing root endpoint...")
+        self._report("🔍 Testing root endpoint...")
         
         response = await self.client.get(f"{self.base_url}/")
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
         assert data["name"] == "Semantic Search API"
         assert data["version"] == "1.0.0"
         assert "endpoints" in data
-        print("✅ Root endpoint passed")
+        self._report("✅ Root endpoint passed")
     
     async def test_product_crud(self):
         """Test product CRUD operations."""
@@ -72,7 +117,7 @@ class APITester:
         
         # Create a product
         product_data = {
-            "id": "test-laptop-001",
+            "id": f"test-laptop-{self._suite}",
             "title": "Test MacBook Pro",
             "description": "High-performance laptop for testing with M2 chip and 16GB RAM"
         }
@@ -83,7 +128,7 @@ class APITester:
             headers=self.get_headers(auth_required=True)
         )
         assert response.status_code == 201
-        created_product = response.json()
+        created_product = orjson.loads(response.content)
         assert created_product["id"] == product_data["id"]
         assert created_product["title"] == product_data["title"]
         self.test_products.append(product_data["id"])
@@ -92,7 +137,7 @@ class APITester:
         # Get the product
         response = await self.client.get(f"{self.base_url}/api/v1/products/{product_data['id']}")
         assert response.status_code == 200
-        retrieved_product = response.json()
+        retrieved_product = orjson.loads(response.content)
         assert retrieved_product["id"] == product_data["id"]
         print("✅ Product retrieval passed")
         
@@ -108,14 +153,14 @@ class APITester:
             headers=self.get_headers(auth_required=True)
         )
         assert response.status_code == 200
-        updated_product = response.json()
+        updated_product = orjson.loads(response.content)
         assert updated_product["title"] == update_data["title"]
         print("✅ Product update passed")
         
         # List products
         response = await self.client.get(f"{self.base_url}/api/v1/products/?page=1&size=10")
         assert response.status_code == 200
-        products_list = response.json()
+        products_list = orjson.loads(response.content)
         assert "products" in products_list
         assert "total" in products_list
         assert products_list["total"] >= 1
@@ -129,17 +174,17 @@ class APITester:
         batch_data = {
             "products": [
                 {
-                    "id": "batch-phone-001",
+                    "id": f"batch-phone-{self._suite}",
                     "title": "iPhone 15 Pro",
                     "description": "Latest iPhone with advanced camera and A17 chip"
                 },
                 {
-                    "id": "batch-tablet-001", 
+                    "id": f"batch-tablet-{self._suite}", 
                     "title": "iPad Pro 12.9",
                     "description": "Professional tablet with M2 chip and Liquid Retina display"
                 },
                 {
-                    "id": "batch-watch-001",
+                    "id": f"batch-watch-{self._suite}",
                     "title": "Apple Watch Series 9",
                     "description": "Advanced smartwatch with health monitoring and GPS"
                 }
@@ -152,7 +197,7 @@ class APITester:
             headers=self.get_headers(auth_required=True)
         )
         assert response.status_code == 201
-        batch_result = response.json()
+        batch_result = orjson.loads(response.content)
         assert batch_result["success_count"] == 3
         assert batch_result["failure_count"] == 0
         
@@ -164,10 +209,10 @@ class APITester:
         """Test search functionality."""
         print("🔍 Testing search functionality...")
         
-        # Wait a moment for indexing
-        await asyncio.sleep(2)
+        # Wait until the created products are indexed
+        await self._await_indexed(len(self.test_products))
         
-        # Test hybrid search
+        # Hybrid, semantic and keyword searches are independent: send them concurrently
         search_data = {
             "query": "laptop professional development",
             "search_type": "hybrid",
@@ -177,74 +222,78 @@ class APITester:
             "include_product_details": True
         }
         
-        response = await self.client.post(
-            f"{self.base_url}/api/v1/search/",
-            json=search_data
+        hybrid_response, semantic_response, keyword_response = await asyncio.gather(
+            self.client.post(
+                f"{self.base_url}/api/v1/search/",
+                json=search_data
+            ),
+            self.client.post(
+                f"{self.base_url}/api/v1/search/semantic",
+                params={
+                    "query": "mobile phone communication",
+                    "top_k": 3,
+                    "include_product_details": True
+                }
+            ),
+            self.client.post(
+                f"{self.base_url}/api/v1/search/keyword",
+                params={
+                    "query": "iPhone camera",
+                    "top_k": 3,
+                    "include_product_details": False
+                }
+            )
         )
-        assert response.status_code == 200
-        search_result = response.json()
+        
+        # Test hybrid search
+        assert hybrid_response.status_code == 200
+        search_result = orjson.loads(hybrid_response.content)
         assert "results" in search_result
         assert search_result["search_type"] == "hybrid"
         assert "weights" in search_result
         print("✅ Hybrid search passed")
         
         # Test semantic search
-        response = await self.client.post(
-            f"{self.base_url}/api/v1/search/semantic",
-            params={
-                "query": "mobile phone communication",
-                "top_k": 3,
-                "include_product_details": True
-            }
-        )
-        assert response.status_code == 200
-        search_result = response.json()
+        assert semantic_response.status_code == 200
+        search_result = orjson.loads(semantic_response.content)
         assert search_result["search_type"] == "semantic"
         print("✅ Semantic search passed")
         
         # Test keyword search
-        response = await self.client.post(
-            f"{self.base_url}/api/v1/search/keyword",
-            params={
-                "query": "iPhone camera",
-                "top_k": 3,
-                "include_product_details": False
-            }
-        )
-        assert response.status_code == 200
-        search_result = response.json()
+        assert keyword_response.status_code == 200
+        search_result = orjson.loads(keyword_response.content)
         assert search_result["search_type"] == "keyword"
         print("✅ Keyword search passed")
     
     async def test_search_statistics(self):
         """Test search statistics."""
-        print("🔍 Testing search statistics...")
+        self._report("🔍 Testing search statistics...")
         
         response = await self.client.get(f"{self.base_url}/api/v1/search/stats")
         assert response.status_code == 200
-        stats = response.json()
+        stats = orjson.loads(response.content)
         assert "total_products" in stats
         assert "vector_index_size" in stats
         assert "bm25_index_size" in stats
         assert "vector_dimension" in stats
         assert stats["total_products"] >= 4  # We created at least 4 products
-        print("✅ Search statistics passed")
+        self._report("✅ Search statistics passed")
     
     async def test_error_handling(self):
         """Test error handling."""
-        print("🔍 Testing error handling...")
+        self._report("🔍 Testing error handling...")
         
         # Test 404 - product not found
         response = await self.client.get(f"{self.base_url}/api/v1/products/nonexistent-product")
         assert response.status_code == 404
-        error_data = response.json()
+        error_data = orjson.loads(response.content)
         assert "error" in error_data
         assert "message" in error_data
-        print("✅ 404 error handling passed")
+        self._report("✅ 404 error handling passed")
         
         # Test 409 - duplicate product creation
         duplicate_data = {
-            "id": "test-laptop-001",  # This already exists
+            "id": f"test-laptop-{self._suite}",  # This already exists
             "title": "Duplicate Product",
             "description": "This should fail"
         }
@@ -255,7 +304,7 @@ class APITester:
             headers=self.get_headers(auth_required=True)
         )
         assert response.status_code == 409
-        print("✅ 409 conflict handling passed")
+        self._report("✅ 409 conflict handling passed")
         
         # Test 422 - validation error
         invalid_data = {
@@ -270,11 +319,11 @@ class APITester:
             headers=self.get_headers(auth_required=True)
         )
         assert response.status_code == 422
-        print("✅ 422 validation error handling passed")
+        self._report("✅ 422 validation error handling passed")
     
     async def test_admin_operations(self):
         """Test admin operations."""
-        print("🔍 Testing admin operations...")
+        self._report("🔍 Testing admin operations...")
         
         # Test rebuild indexes
         response = await self.client.post(
@@ -282,40 +331,98 @@ class APITester:
             headers=self.get_headers(auth_required=True)
         )
         assert response.status_code == 200
-        result = response.json()
+        result = orjson.loads(response.content)
         assert "message" in result
-        print("✅ Index rebuild passed")
-        
-        # Wait for rebuild to complete
-        await asyncio.sleep(2)
+        self._report("✅ Index rebuild passed")
         
-        # Verify search still works after rebuild
+        # Verify search still works after rebuild (the endpoint only responds once it is done)
         response = await self.client.post(
             f"{self.base_url}/api/v1/search/semantic",
             params={"query": "laptop", "top_k": 1}
         )
         assert response.status_code == 200
-        print("✅ Search after rebuild passed")
+        self._report("✅ Search after rebuild passed")
+    
+    async def test_concurrency(self, n: int = 32, concurrency: int = 8):
+        """Test concurrent request handling and report throughput and latency percentiles."""
+        print(f"🔍 Testing {n} concurrent searches ({concurrency} in flight)...")
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        # Keyword search: exercises the server without one embeddings API call per request
+        async def one(i: int):
+            async with semaphore:
+                start = time.perf_counter()
+                response = await self.client.post(
+                    f"{self.base_url}/api/v1/search/keyword",
+                    params={"query": f"laptop {i}", "top_k": 1}
+                )
+                return response.status_code, time.perf_counter() - start
+        
+        start_time = time.perf_counter()
+        results = await asyncio.gather(*[one(i) for i in range(n)])
+        elapsed = time.perf_counter() - start_time
+        
+        # RateLimitMiddleware allows 1000 calls/hour per IP: after a few runs in the same hour
+        # the limiter answers 429, which is expected and not a server failure
+        statuses = [status_code for status_code, _ in results]
+        rate_limited = statuses.count(429)
+        failed = n - statuses.count(200) - rate_limited
+        assert failed == 0, f"{failed} of {n} requests failed"
+        if rate_limited:
+            self._report(f"⚠️  {rate_limited} of {n} requests rate limited (429)")
+        
+        latencies_ms = sorted(latency * 1000 for _, latency in results)
+        p50, p95, p99 = (latencies_ms[min(n - 1, int(q * n))] for q in (0.50, 0.95, 0.99))
+        print(f"✅ Concurrency passed: {n / elapsed:.0f} req/s, "
+              f"p50 {p50:.1f}ms, p95 {p95:.1f}ms, p99 {p99:.1f}ms")
+    
+    async def _delete_one(self, product_id: str):
+        """Delete a single test product and return the line reporting the outcome."""
+        try:
+            response = await self.client.delete(
+                f"{self.base_url}/api/v1/products/{product_id}",
+                headers=self.get_headers(auth_required=True)
+            )
+            if response.status_code == 200:
+                return f"✅ Deleted product {product_id}"
+            elif response.status_code == 404:
+                return f"⚠️  Product {product_id} not found (may have been deleted already)"
+            else:
+                return f"❌ Failed to delete product {product_id}: {response.status_code}"
+        except Exception as e:
+            return f"❌ Error deleting product {product_id}: {e}"
     
     async def cleanup(self):
         """Clean up test data."""
         print("🧹 Cleaning up test data...")
         
-        # Delete individual products
-        for product_id in self.test_products:
-            try:
-                response = await self.client.delete(
-                    f"{self.base_url}/api/v1/products/{product_id}",
-                    headers=self.get_headers(auth_required=True)
-                )
-                if response.status_code == 200:
-                    print(f"✅ Deleted product {product_id}")
-                elif response.status_code == 404:
-                    print(f"⚠️  Product {product_id} not found (may have been deleted already)")
-                else:
-                    print(f"❌ Failed to delete product {product_id}: {response.status_code}")
-            except Exception as e:
-                print(f"❌ Error deleting product {product_id}: {e}")
+        if not self.test_products:
+            return
+        
+        # One batch request for all test products
+        response = await self.client.request(
+            "DELETE",
+            f"{self.base_url}/api/v1/products/batch",
+            json={"product_ids": self.test_products},
+            headers=self.get_headers(auth_required=True)
+        )
+        if response.status_code == 200:
+            result = orjson.loads(response.content)
+            for product_id in result["successful"]:
+                print(f"✅ Deleted product {product_id}")
+            for item in result["failed"]:
+                print(f"⚠️  Product {item['id']} not deleted: {item['error']}")
+            return
+        if not 400 <= response.status_code < 500:
+            print(f"❌ Batch delete failed: {response.status_code}")
+            return
+        
+        # Fall back to individual deletes, concurrently over the pooled connections
+        print(f"⚠️  Batch delete rejected ({response.status_code}), deleting products individually")
+        # Reported after gather, in test_products order
+        for line in await asyncio.gather(*[self._delete_one(product_id) for product_id in self.test_products]):
+            print(line)
     
     async def run_all_tests(self):
         """Run all tests."""
@@ -323,20 +430,35 @@ class APITester:
         print(f"🎯 Testing API at: {self.base_url}")
         print("=" * 60)
         
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         try:
-            # Core functionality tests
-            await self.test_health_check()
-            await self.test_root_endpoint()
+            # Phase A: tests that create the test data, in order
             await self.test_product_crud()
             await self.test_batch_operations()
             await self.test_search_functionality()
-            await self.test_search_statistics()
-            await self.test_error_handling()
-            await self.test_admin_operations()
             
-            execution_time = time.time() - start_time
+            # Phase B: independent checks over that data, run concurrently
+            # (none of them adds to self.test_products). Each one's output is printed
+            # after gather, test by test, so the lines do not interleave
+            outcomes = await asyncio.gather(
+                self._buffered(self.test_health_check),
+                self._buffered(self.test_root_endpoint),
+                self._buffered(self.test_search_statistics),
+                self._buffered(self.test_error_handling),
+                self._buffered(self.test_admin_operations)
+            )
+            for lines, _ in outcomes:
+                for line in lines:
+                    print(line)
+            for _, error in outcomes:
+                if error is not None:
+                    raise error
+            
+            # Phase C: load check, alone so the other tests do not skew its latencies
+            await self.test_concurrency()
+            
+            execution_time = time.perf_counter() - start_time
             
             print("=" * 60)
             print(f"🎉 All tests passed successfully!")
@@ -353,29 +475,31 @@ class APITester:
 async def main():
     """Main test execution."""
     async with APITester(BASE_URL, API_KEY) as tester:
-        await tester.run_all_tests()
-
-
-if __name__ == "__main__":
-    # Check if server is running
-    try:
-        import httpx
-        response = httpx.get(f"{BASE_URL}/health", timeout=5)
-        if response.status_code != 200:
-            print(f"❌ Server is not responding correctly at {BASE_URL}")
+        # Check if server is running, over the same pooled connection the tests use
+        try:
+            response = await tester.client.get(f"{BASE_URL}/health", timeout=5)
+            if response.status_code != 200:
+                print(f"❌ Server is not responding correctly at {BASE_URL}")
+                print("Please make sure the API server is running:")
+                print("  python main.py")
+                print("  or")
+                print("  uvicorn main:app --reload")
+                return False
+        except Exception as e:
+            print(f"❌ Cannot connect to server at {BASE_URL}")
+            print(f"Error: {e}")
             print("Please make sure the API server is running:")
             print("  python main.py")
             print("  or")
             print("  uvicorn main:app --reload")
-            exit(1)
-    except Exception as e:
-        print(f"❌ Cannot connect to server at {BASE_URL}")
-        print(f"Error: {e}")
-        print("Please make sure the API server is running:")
-        print("  python main.py")
-        print("  or")
-        print("  uvicorn main:app --reload")
-        exit(1)
-    
+            return False
+        
+        await tester.run_all_tests()
+        return True
+
+
+if __name__ == "__main__":
     # Run tests
-    asyncio.run(main()) 
\ No newline at end of file
+    run = uvloop.run if uvloop else asyncio.run
+    if not run(main()):
+        exit(1) 
\ No newline at end of file
@@ -3,16 +3,29 @@
 Simple test script for batch product insertion API
 """
 
+import asyncio
 import json
-import requests
 import time
+import httpx
+import orjson
+
+try:
+    import uvloop
+except ImportError:  # uvloop is optional (POSIX only, comes with uvicorn[standard]), falls back to asyncio's loop
+    uvloop = None
 
 # Configuration
 API_BASE_URL = "http://localhost:8000"
 API_KEY = "test-api-key-1234567890"
 
-def test_batch_insert():
-    """Test the batch insert functionality"""
+# Shared keep-alive client for every request of the run
+client = httpx.AsyncClient(
+    timeout=30,
+    limits=httpx.Limits(max_keepalive_connections=10)
+)
+
+async def test_batch_insert():
+    """Test the batch insert functionality, returning the number of products inserted"""
     print("🚀 Testing Batch Product Insert API")
     print("=" * 40)
     
@@ -34,15 +47,14 @@ def test_batch_insert():
     
     try:
         # Send batch insert request
-        response = requests.post(
+        response = await client.post(
             f"{API_BASE_URL}/api/v1/products/batch",
             headers=headers,
-            json=payload,
-            timeout=30
+            json=payload
         )
         
         if response.status_code == 201:
-            result = response.json()
+            result = orjson.loads(response.content)
             print("✅ Batch insert successful!")
             print(f"   - Success count: {result['success_count']}")
             print(f"   - Failure count: {result['failure_count']}")
@@ -53,22 +65,34 @@ def test_batch_insert():
                 for failure in result['failed']:
                     print(f"   - {failure['id']}: {failure['error']}")
             
-            return True
+            return result['success_count']
         else:
             print(f"❌ Batch insert failed with status {response.status_code}")
             print(f"   Response: {response.text}")
             return False
             
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         print(f"❌ Request failed: {e}")
         return False
 
-def test_search():
+async def wait_until_indexed(expected_total, timeout=5.0):
+    """Poll search stats until the indexes hold at least expected_total products"""
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            response = await client.get(f"{API_BASE_URL}/api/v1/search/stats")
+            if response.status_code == 200 and orjson.loads(response.content)["total_products"] >= expected_total:
+                return
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.05)
+
+async def test_search(expected_total):
     """Test search functionality"""
     print("\n🔍 Testing search functionality...")
     
-    # Wait a moment for indexing
-    time.sleep(2)
+    # Wait until the inserted products are indexed
+    await wait_until_indexed(expected_total)
     
     search_payload = {
         "query": "laptop professional development",
@@ -78,15 +102,14 @@ def test_search():
     }
     
     try:
-        response = requests.post(
+        response = await client.post(
             f"{API_BASE_URL}/api/v1/search/",
             headers={"Content-Type": "application/json"},
-            json=search_payload,
-            timeout=30
+            json=search_payload
         )
         
         if response.status_code == 200:
-            result = response.json()
+            result = orjson.loads(response.content)
             print("✅ Search successful!")
             print(f"   - Query: '{result['query']}'")
             print(f"   - Search type: {result['search_type']}")
@@ -106,36 +129,40 @@ def test_search():
             print(f"   Response: {response.text}")
             return False
             
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         print(f"❌ Search request failed: {e}")
         return False
 
-def check_api_health():
+async def check_api_health():
     """Check if the API is running"""
     try:
-        response = requests.get(f"{API_BASE_URL}/health", timeout=5)
+        response = await client.get(f"{API_BASE_URL}/health", timeout=5)
         return response.status_code == 200
     except:
         return False
 
-def main():
+async def main():
     """Main test execution"""
     
-    # Check if API is running
-    if not check_api_health():
-        print("❌ API is not running or not accessible at http://localhost:8000")
-        print("   Please start the API first:")
-        print("   python main.py")
-        return
-    
-    print("✅ API is running")
-    
-    # Run tests
-    batch_success = test_batch_insert()
-    if batch_success:
-        test_search()
-    
-    print("\n🏁 Test completed!")
+    try:
+        # Check if API is running
+        if not await check_api_health():
+            print("❌ API is not running or not accessible at http://localhost:8000")
+            print("   Please start the API first:")
+            print("   python main.py")
+            return
+        
+        print("✅ API is running")
+        
+        # Run tests
+        inserted = await test_batch_insert()
+        if inserted:
+            await test_search(inserted)
+        
+        print("\n🏁 Test completed!")
+    finally:
+        await client.aclose()
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    run = uvloop.run if uvloop else asyncio.run
+    run(main()) 
\ No newline at end of file
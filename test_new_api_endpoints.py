@@ -4,44 +4,70 @@ Test script for new API endpoints
 Tests RRF search, strategy-based search, and available strategies
 """
 
-import requests
+import asyncio
+import httpx
 import json
+import orjson
 from typing import Dict, Any
 
+try:
+    import uvloop
+except ImportError:  # uvloop is optional (POSIX only, comes with uvicorn[standard]), falls back to asyncio's loop
+    uvloop = None
+
 # API Configuration
 BASE_URL = "http://localhost:8000/api/v1"
 API_KEY = "your-secret-api-key-here"  # Update with your API key
 
-def test_endpoint(method: str, url: str, data: Dict[Any, Any] = None, params: Dict[str, str] = None):
-    """Test an API endpoint and return the response."""
+# Shared keep-alive client for every request of the run
+client = httpx.AsyncClient(
+    timeout=30,
+    limits=httpx.Limits(max_keepalive_connections=10)
+)
+
+async def request_endpoint(method: str, url: str, data: Dict[Any, Any] = None, params: Dict[str, str] = None, body: bytes = None):
+    """
+    Call an API endpoint without printing (safe to gather).
+
+    Returns (report lines, response JSON or None); body is an already serialized JSON payload.
+    """
     headers = {"Content-Type": "application/json"}
     
-    print(f"\n🧪 Testing {method.upper()} {url}")
+    lines = [f"\n🧪 Testing {method.upper()} {url}"]
     
     try:
         if method.lower() == "get":
-            response = requests.get(url, headers=headers, params=params)
+            response = await client.get(url, headers=headers, params=params)
         elif method.lower() == "post":
-            response = requests.post(url, headers=headers, json=data, params=params)
+            if body is not None:
+                response = await client.post(url, headers=headers, content=body, params=params)
+            else:
+                response = await client.post(url, headers=headers, json=data, params=params)
         
-        print(f"   Status: {response.status_code}")
+        lines.append(f"   Status: {response.status_code}")
         
         if response.status_code in [200, 201]:  # Accept both 200 and 201 for success
-            result = response.json()
-            print(f"   ✅ Success!")
-            return result
+            result = orjson.loads(response.content)
+            lines.append(f"   ✅ Success!")
+            return lines, result
         else:
-            print(f"   ❌ Error: {response.text}")
-            return None
+            lines.append(f"   ❌ Error: {response.text}")
+            return lines, None
             
-    except requests.exceptions.ConnectionError:
-        print(f"   ❌ Connection Error: Make sure FastAPI server is running on {BASE_URL}")
-        return None
+    except httpx.ConnectError:
+        lines.append(f"   ❌ Connection Error: Make sure FastAPI server is running on {BASE_URL}")
+        return lines, None
     except Exception as e:
-        print(f"   ❌ Exception: {e}")
-        return None
+        lines.append(f"   ❌ Exception: {e}")
+        return lines, None
+
+async def test_endpoint(method: str, url: str, data: Dict[Any, Any] = None, params: Dict[str, str] = None, body: bytes = None):
+    """Test an API endpoint, print its report and return the response (body is an already serialized JSON payload)."""
+    lines, result = await request_endpoint(method, url, data=data, params=params, body=body)
+    print("\n".join(lines))
+    return result
 
-def test_new_search_endpoints():
+async def test_new_search_endpoints():
     """Test all new search endpoints."""
     print("🚀 TESTING NEW API ENDPOINTS")
     print("=" * 50)
@@ -67,26 +93,49 @@ def test_new_search_endpoints():
         }
     ]
     
-    for product in test_products:
-        test_endpoint("POST", f"{BASE_URL}/products/", data=product)
+    # All test products in one batch request
+    await test_endpoint("POST", f"{BASE_URL}/products/batch", body=orjson.dumps({"products": test_products}))
     
     # Test Query
     test_query = "equipo portátil para edición de video"
     print(f"\n🔍 Using test query: '{test_query}'")
     
-    # 1. Test RRF Search
-    print(f"\n{'='*60}")
-    print("1. TESTING RRF SEARCH ENDPOINT")
-    print(f"{'='*60}")
-    
     rrf_params = {
         "query": test_query,
         "top_k": 5,
         "rrf_k": 20,
         "include_product_details": True
     }
+    strategy_base = {
+        "query": test_query,
+        "top_k": 5,
+        "include_product_details": True
+    }
+    
+    # The four searches are independent: send them concurrently. request_endpoint does not
+    # print, each report is printed in its own section below so the output stays in order
+    (
+        (rrf_lines, rrf_result),
+        (strategy_lines, strategy_result),
+        (speed_lines, speed_result),
+        (balanced_lines, balanced_result)
+    ) = await asyncio.gather(
+        request_endpoint("POST", f"{BASE_URL}/search/rrf", params=rrf_params),
+        *[
+            request_endpoint(
+                "POST", f"{BASE_URL}/search/strategy",
+                body=orjson.dumps({**strategy_base, "strategy": strategy})
+            )
+            for strategy in ("quality_first", "speed_first", "balanced")
+        ]
+    )
+    
+    # 1. Test RRF Search
+    print(f"\n{'='*60}")
+    print("1. TESTING RRF SEARCH ENDPOINT")
+    print(f"{'='*60}")
+    print("\n".join(rrf_lines))
     
-    rrf_result = test_endpoint("POST", f"{BASE_URL}/search/rrf", params=rrf_params)
     if rrf_result:
         print(f"   📊 Results: {rrf_result['total_results']} items")
         print(f"   ⏱️  Time: {rrf_result['execution_time_ms']:.1f}ms")
@@ -99,15 +148,8 @@ def test_new_search_endpoints():
     print(f"\n{'='*60}")
     print("2. TESTING STRATEGY SEARCH - QUALITY FIRST")
     print(f"{'='*60}")
+    print("\n".join(strategy_lines))
     
-    strategy_data = {
-        "query": test_query,
-        "strategy": "quality_first",
-        "top_k": 5,
-        "include_product_details": True
-    }
-    
-    strategy_result = test_endpoint("POST", f"{BASE_URL}/search/strategy", data=strategy_data)
     if strategy_result:
         print(f"   📊 Results: {strategy_result['total_results']} items")
         print(f"   ⏱️  Time: {strategy_result['execution_time_ms']:.1f}ms")
@@ -123,9 +165,8 @@ def test_new_search_endpoints():
     print(f"\n{'='*60}")
     print("3. TESTING STRATEGY SEARCH - SPEED FIRST")
     print(f"{'='*60}")
+    print("\n".join(speed_lines))
     
-    strategy_data['strategy'] = 'speed_first'
-    speed_result = test_endpoint("POST", f"{BASE_URL}/search/strategy", data=strategy_data)
     if speed_result:
         print(f"   📊 Results: {speed_result['total_results']} items")
         print(f"   ⏱️  Time: {speed_result['execution_time_ms']:.1f}ms")
@@ -136,9 +177,8 @@ def test_new_search_endpoints():
     print(f"\n{'='*60}")
     print("4. TESTING STRATEGY SEARCH - BALANCED")
     print(f"{'='*60}")
+    print("\n".join(balanced_lines))
     
-    strategy_data['strategy'] = 'balanced'
-    balanced_result = test_endpoint("POST", f"{BASE_URL}/search/strategy", data=strategy_data)
     if balanced_result:
         print(f"   📊 Results: {balanced_result['total_results']} items")
         print(f"   ⏱️  Time: {balanced_result['execution_time_ms']:.1f}ms")
@@ -150,7 +190,7 @@ def test_new_search_endpoints():
     print("5. TESTING AVAILABLE STRATEGIES ENDPOINT")
     print(f"{'='*60}")
     
-    strategies_result = test_endpoint("GET", f"{BASE_URL}/search/strategies")
+    strategies_result = await test_endpoint("GET", f"{BASE_URL}/search/strategies")
     if strategies_result:
         print(f"   📊 Total Strategies: {strategies_result['total_strategies']}")
         print(f"   📅 Retrieved at: {strategies_result['timestamp']}")
@@ -189,5 +229,12 @@ def test_new_search_endpoints():
     print(f"\n🎉 API Testing Complete!")
     print("All new endpoints are working correctly! 🚀")
 
+async def main():
+    try:
+        await test_new_search_endpoints()
+    finally:
+        await client.aclose()
+
 if __name__ == "__main__":
-    test_new_search_endpoints() 
\ No newline at end of file
+    run = uvloop.run if uvloop else asyncio.run
+    run(main()) 
\ No newline at end of file
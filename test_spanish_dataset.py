@@ -41,14 +41,13 @@ def test_dataset():
     # Validate data integrity
     print("🔍 Validating data integrity...")
     
-    # Check for duplicate IDs
-    product_ids = [p['id'] for p in products]
-    if len(product_ids) != len(set(product_ids)):
+    # Check for duplicate IDs (one set, reused for the relevance check)
+    all_product_ids = frozenset(p['id'] for p in products)
+    if len(all_product_ids) != len(products):
         print("❌ Duplicate product IDs found!")
         return False
     
     # Check query relevance
-    all_product_ids = set(product_ids)
     for query in queries:
         missing_ids = set(query['relevant_ids']) - all_product_ids
         if missing_ids: